@@ -0,0 +1,177 @@
+import argparse
+import heapq
+import json
+import math
+from collections import Counter
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+
+from thesis import Entry
+
+# Scores are histogrammed into fixed-width bins so shards agree on the edges
+SCORE_BIN_WIDTH = 5
+# Studies kept for the summary's "TOP 3 STUDIES" section
+TOP_STUDIES = 3
+
+class AnalysisAggregate:
+    """Corpus statistics built from analysed entries and merged exactly across shards.
+
+    Every field is a count, a sum or a bounded top-k list, so aggregating
+    shards separately and merging the results gives the same numbers as
+    aggregating the whole corpus at once. The score sum is an exact
+    ``Fraction``, so float scores do not depend on how the corpus was split.
+    Merge shards in corpus order to keep first-seen technique order and
+    score ties as a single pass would. ``to_dict``/``from_dict`` carry a
+    shard between processes or machines as JSON.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.compliant = 0
+        self.technique_counts = Counter()
+        self.compliance_counts = Counter()
+        self.year_counts = Counter()
+        self.publisher_counts = Counter()
+        self.score_bins = Counter()
+        self.score_sum = Fraction(0)
+        self.score_min = None
+        self.score_max = None
+        self.top = []
+
+    @classmethod
+    def from_entries(cls, entries):
+        aggregate = cls()
+        for entry in entries:
+            aggregate.add(entry)
+        return aggregate
+
+    def add(self, entry):
+        """Count one analysed ``Entry``."""
+        self.total += 1
+        techniques = [tech for tech in entry.techniques.split(', ') if tech != 'None']
+        self.technique_counts.update(techniques)
+        if entry.compliance != 'None':
+            self.compliant += 1
+            self.compliance_counts.update(entry.compliance.split(', '))
+        self.year_counts[entry.year] += 1
+        self.publisher_counts[entry.publisher] += 1
+        score = entry.score
+        self.score_bins[math.floor(score / SCORE_BIN_WIDTH) * SCORE_BIN_WIDTH] += 1
+        self.score_sum += Fraction(score)
+        self.score_min = score if self.score_min is None else min(self.score_min, score)
+        self.score_max = score if self.score_max is None else max(self.score_max, score)
+        self._keep_top([{
+            "score": score, "authors": entry.authors, "techniques": entry.techniques,
+            "accuracy": entry.accuracy, "compliance": entry.compliance,
+        }])
+        return self
+
+    def _keep_top(self, studies):
+        # nlargest is stable, so earlier studies win ties as in a sorted list
+        self.top = heapq.nlargest(TOP_STUDIES, self.top + studies, key=lambda study: study["score"])
+
+    def merge(self, other):
+        """Fold another shard's aggregate into this one and return self."""
+        self.total += other.total
+        self.compliant += other.compliant
+        for name in ("technique_counts", "compliance_counts", "year_counts",
+                     "publisher_counts", "score_bins"):
+            getattr(self, name).update(getattr(other, name))
+        self.score_sum += other.score_sum
+        if other.score_min is not None:
+            self.score_min = other.score_min if self.score_min is None else min(self.score_min, other.score_min)
+            self.score_max = other.score_max if self.score_max is None else max(self.score_max, other.score_max)
+        self._keep_top(other.top)
+        return self
+
+    @property
+    def compliance_rate(self):
+        return (self.compliant / self.total * 100) if self.total > 0 else 0
+
+    @property
+    def mean_score(self):
+        return float(self.score_sum / self.total) if self.total > 0 else 0
+
+    def compliance_stats(self):
+        """The dict ``compliance_analysis`` has always returned."""
+        return {
+            'total_studies': self.total,
+            'compliant_studies': self.compliant,
+            'compliance_rate': self.compliance_rate,
+        }
+
+    def to_dict(self):
+        return {
+            "total": self.total,
+            "compliant": self.compliant,
+            "technique_counts": dict(self.technique_counts),
+            "compliance_counts": dict(self.compliance_counts),
+            "year_counts": dict(self.year_counts),
+            "publisher_counts": dict(self.publisher_counts),
+            # JSON object keys are strings, so keep the bins as pairs
+            "score_bins": sorted(self.score_bins.items()),
+            "score_sum": [self.score_sum.numerator, self.score_sum.denominator],
+            "score_min": self.score_min,
+            "score_max": self.score_max,
+            "top": self.top,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregate = cls()
+        aggregate.total = data["total"]
+        aggregate.compliant = data["compliant"]
+        for name in ("technique_counts", "compliance_counts", "year_counts", "publisher_counts"):
+            setattr(aggregate, name, Counter(data[name]))
+        aggregate.score_bins = Counter({low: count for low, count in data["score_bins"]})
+        score_sum = data["score_sum"]
+        aggregate.score_sum = Fraction(*score_sum) if isinstance(score_sum, list) else Fraction(score_sum)
+        aggregate.score_min = data["score_min"]
+        aggregate.score_max = data["score_max"]
+        aggregate.top = list(data["top"])
+        return aggregate
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"Saved aggregate to {path}")
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+def merge_aggregates(aggregates):
+    """Merge shard aggregates, in order, into a new one."""
+    merged = AnalysisAggregate()
+    for aggregate in aggregates:
+        merged.merge(aggregate)
+    return merged
+
+def _slim(entry):
+    """Copy of an analysed entry without its text, for shipping to a worker."""
+    return Entry(score=entry.score, authors=entry.authors, publisher=entry.publisher,
+                 year=entry.year, techniques=entry.techniques, compliance=entry.compliance,
+                 accuracy=entry.accuracy)
+
+def aggregate_in_processes(entries, workers=None, shard_size=10000):
+    """Aggregate contiguous shards of ``entries`` in worker processes and merge them."""
+    shards = [[_slim(entry) for entry in entries[start:start + shard_size]]
+              for start in range(0, len(entries), shard_size)]
+    if len(shards) < 2 or workers == 1:
+        return merge_aggregates(AnalysisAggregate.from_entries(shard) for shard in shards)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge_aggregates(pool.map(AnalysisAggregate.from_entries, shards))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge shard aggregates and write the summary report.")
+    parser.add_argument("shards", nargs="+", help="aggregate JSON files saved with --save-aggregate")
+    parser.add_argument("--output", metavar="JSON", help="also save the merged aggregate here")
+    args = parser.parse_args()
+    # Imported here; thesis_analysis itself imports this module
+    from thesis_analysis import compliance_analysis, save_summary
+    merged = merge_aggregates(AnalysisAggregate.load(path) for path in args.shards)
+    compliance_analysis(merged)
+    save_summary(merged)
+    if args.output:
+        merged.save(args.output)
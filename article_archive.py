@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+
+from thesis import Entry
+
+# Archive layout: MAGIC, then one record per article:
+#   uint32 header length | uint32 payload length | header JSON | zlib(text)
+# The sidecar ``<archive>.idx`` holds one JSON line per record with its rank,
+# DOI and offset, appended as the record is written.
+MAGIC = b"ARTARC01"
+_RECORD = struct.Struct("<II")
+ARCHIVE_PATH = "extracted_articles.zarc"
+
+class ArticleArchiveWriter:
+    """Append articles to an archive, each compressed on its own.
+
+    Records and index lines are flushed as they are appended, so a reader
+    can open a partially written archive and an interrupted run keeps every
+    article written so far.
+    """
+
+    def __init__(self, path=ARCHIVE_PATH, level=6):
+        self.path = path
+        self.level = level
+        self.count = 0
+        self._data = open(path, "wb")
+        self._data.write(MAGIC)
+        self._index = open(path + ".idx", "w", encoding="utf-8")
+
+    def append(self, entry):
+        """Compress and append one ``Entry``; returns its offset in the archive."""
+        rank = entry.rank if entry.rank is not None else self.count + 1
+        header = json.dumps({"rank": rank, "score": entry.score, "authors": entry.authors,
+                             "doi": entry.doi, "publisher": entry.publisher}).encode("utf-8")
+        payload = zlib.compress(entry.text.encode("utf-8"), self.level)
+        offset = self._data.tell()
+        self._data.write(_RECORD.pack(len(header), len(payload)))
+        self._data.write(header)
+        self._data.write(payload)
+        self._data.flush()
+        self._index.write(json.dumps({"rank": rank, "doi": entry.doi, "offset": offset}) + "\n")
+        self._index.flush()
+        self.count += 1
+        return offset
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class ArticleArchive:
+    """Random access to the articles of an archive by rank or DOI.
+
+    The offset index is read once; fetching an article is then one seek and
+    one read of that article alone. A missing or truncated index is rebuilt
+    by walking the record headers, which skips over every payload.
+    """
+
+    def __init__(self, path=ARCHIVE_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError(f"Not an article archive: {path}")
+        self.offsets = self._read_index()
+        self.by_rank = {}
+        self.by_doi = {}
+        for record in self.offsets:
+            self.by_rank.setdefault(record["rank"], record["offset"])
+            if record["doi"] != "Unknown":
+                self.by_doi.setdefault(record["doi"].lower(), record["offset"])
+
+    def _read_index(self):
+        size = os.fstat(self._file.fileno()).st_size
+        try:
+            with open(self.path + ".idx", encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+            if self._index_covers(records, size):
+                return records
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+        return self._scan_index(size)
+
+    def _index_covers(self, records, size):
+        """True when the index lists every complete record, back to back up to ``size``.
+
+        Each listed record must end where the next one starts, so an index
+        that lost any of its lines (a run killed between the data and index
+        flushes, or a damaged file) or points past a truncated archive fails
+        the check. Only the fixed-size record prefixes are read.
+        """
+        end = len(MAGIC)
+        for record in records:
+            if record["offset"] != end or end + _RECORD.size > size:
+                return False
+            self._file.seek(end)
+            header_len, payload_len = _RECORD.unpack(self._file.read(_RECORD.size))
+            end += _RECORD.size + header_len + payload_len
+        return end == size
+
+    def _scan_index(self, size):
+        records = []
+        offset = len(MAGIC)
+        while offset + _RECORD.size <= size:
+            self._file.seek(offset)
+            header_len, payload_len = _RECORD.unpack(self._file.read(_RECORD.size))
+            end = offset + _RECORD.size + header_len + payload_len
+            if end > size:
+                break  # a record cut short by an interrupted write
+            header = json.loads(self._file.read(header_len))
+            records.append({"rank": header["rank"], "doi": header["doi"], "offset": offset})
+            offset = end
+        return records
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def read(self, offset):
+        """Return the ``Entry`` stored at ``offset``, text included."""
+        self._file.seek(offset)
+        header_len, payload_len = _RECORD.unpack(self._file.read(_RECORD.size))
+        header = json.loads(self._file.read(header_len))
+        text = zlib.decompress(self._file.read(payload_len)).decode("utf-8")
+        return Entry(text, **header)
+
+    def get(self, rank=None, doi=None):
+        """Return the article with this rank or DOI, or None."""
+        offset = self.by_rank.get(rank) if doi is None else self.by_doi.get(doi.lower())
+        return None if offset is None else self.read(offset)
+
+    def __iter__(self):
+        for record in self.offsets:
+            yield self.read(record["offset"])
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def write_text(entry, f):
+    """Write one article in the old extracted_text.txt layout."""
+    f.write(f"=== ARTICLE (Score: {entry.score}) ===\n")
+    f.write(f"Authors: {entry.authors}\n")
+    f.write(f"DOI: {entry.doi}\n")
+    f.write(f"Publisher: {entry.publisher}\n")
+    f.write("Text:\n")
+    f.write(entry.text)
+    f.write("\n\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print articles from an extracted-article archive.")
+    parser.add_argument("archive", nargs="?", default=ARCHIVE_PATH)
+    parser.add_argument("--rank", type=int, help="print only the article with this rank")
+    parser.add_argument("--doi", help="print only the article with this DOI")
+    parser.add_argument("--list", action="store_true", help="list the rank and DOI of every article")
+    args = parser.parse_args()
+    with ArticleArchive(args.archive) as archive:
+        if args.list:
+            for record in archive.offsets:
+                print(f"{record['rank']}\t{record['doi']}")
+        elif args.rank is not None or args.doi:
+            entry = archive.get(args.rank, args.doi)
+            if entry is None:
+                sys.exit("No such article in the archive")
+            write_text(entry, sys.stdout)
+        else:
+            for entry in archive:
+                write_text(entry, sys.stdout)
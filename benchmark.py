@@ -0,0 +1,200 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+import thesis
+import thesis_analysis
+from aggregates import AnalysisAggregate
+
+SCALES = [100, 1000, 10000, 100000]
+LINES_PER_PAGE = 60
+MATCHED_TOP_N = 100
+
+SURNAMES = ["Rehman", "Choudhury", "Park", "Shalabi", "Ghazal", "Pati", "Shen", "Krishnan",
+            "Volmer", "Dekker", "Lee", "Harada", "Zhao", "Kumar", "Mosavi", "Adnan"]
+GIVEN = ["Abdur", "Ananya", "Soyoung", "Eman", "Taher", "Sarthak", "Jiachen", "Leroy"]
+SUBJECTS = ["Federated learning", "Differential privacy", "Homomorphic encryption",
+            "Medical imaging", "Electronic health records", "Blockchain", "Privacy"]
+JOURNALS = ["JMIR AI", "IEEE Access", "Scientific Reports", "Journal of Biomedical Informatics"]
+PUBLISHERS = ["Canada", "IEEE", "Springer Nature", "Elsevier B.V", "MDPI AG"]
+SENTENCES = [
+    "We propose a federated learning framework for clinical data sharing across hospitals.",
+    "Differential privacy with a privacy budget epsilon = 1.0 protects patient records.",
+    "Homomorphic encryption keeps model updates confidential during aggregation.",
+    "The model reaches accuracy: 93.22% on chest x-ray and CT diagnosis tasks.",
+    "Secure multiparty computation and trusted execution environment nodes reduce overhead.",
+    "We evaluate membership attack, model inversion and gradient leakage threats.",
+    "The design is compliant with GDPR and HIPAA requirements for EHR processing.",
+    "Communication cost and latency remain practical for wearable ICU monitoring.",
+    "Blockchain auditing detects data poisoning and byzantine clients.",
+    "Results are reported as AUC and F1 for treatment outcome prediction.",
+    "Participants were recruited in 2021 and followed up until 2023.",
+]
+
+def make_record(i, rng):
+    """Return one Ex Libris-style record with the fields extract_metadata reads."""
+    authors = " ; ".join(f"{rng.choice(SURNAMES)}, {rng.choice(GIVEN)}"
+                         for _ in range(rng.randint(1, 6)))
+    description = " ".join(rng.choice(SENTENCES) for _ in range(rng.randint(3, 8)))
+    year = rng.randint(2015, 2025)
+    return (
+        f"Author: {authors}\n"
+        f"Subject: {' ; '.join(rng.sample(SUBJECTS, 3))}\n"
+        f"Is Part Of: {rng.choice(JOURNALS)}, {year}, Vol.{rng.randint(1, 40)}\n"
+        f"Description: {description}\n"
+        f"Publisher: {rng.choice(PUBLISHERS)}\n"
+        f"Identifier: DOI: 10.{rng.randint(1000, 99999)}/bench.{i}\n"
+    )
+
+def make_records(count, seed=0):
+    rng = random.Random(seed)
+    return [make_record(i, rng) for i in range(count)]
+
+def _wrap(text, width=110):
+    """Split text into lines short enough to fit on a PDF page."""
+    lines = []
+    for paragraph in text.split("\n"):
+        while len(paragraph) > width:
+            cut = paragraph.rfind(" ", 0, width)
+            cut = cut if cut > 0 else width
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        lines.append(paragraph)
+    return lines
+
+def write_export_pdf(path, records):
+    """Write records back to back, as a catalogue export, flowing across pages."""
+    doc = fitz.open()
+    lines = [line for record in records for line in _wrap(record)]
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        page = doc.new_page()
+        page.insert_text((36, 36), "\n".join(lines[start:start + LINES_PER_PAGE]), fontsize=7)
+    doc.save(path)
+    doc.close()
+
+def write_articles_pdf(path, records):
+    """Write one page per record, as the full-text PDF extract_matched_articles reads."""
+    doc = fitz.open()
+    for record in records:
+        page = doc.new_page()
+        page.insert_text((36, 36), "\n".join(_wrap(record)[:LINES_PER_PAGE]), fontsize=7)
+    doc.save(path)
+    doc.close()
+
+def _best_of(repeat, func):
+    """Run ``func`` ``repeat`` times and return (best seconds, last result)."""
+    best, result = None, None
+    for _ in range(repeat):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def bench_scale(count, workdir, repeat=1, seed=0):
+    """Time every pipeline stage on a synthetic corpus of ``count`` records."""
+    records = make_records(count, seed)
+    export_pdf = os.path.join(workdir, f"export_{count}.pdf")
+    articles_pdf = os.path.join(workdir, f"articles_{count}.pdf")
+    write_export_pdf(export_pdf, records)
+    top_n = min(count, MATCHED_TOP_N)
+    timings = {}
+
+    timings["extract_entries"], entries = _best_of(
+        repeat, lambda: thesis.extract_entries(export_pdf))
+    timings["keyword_score"], _ = _best_of(
+        repeat, lambda: [thesis.keyword_score(entry) for entry in entries])
+    timings["rank_entries"], ranked = _best_of(
+        repeat, lambda: thesis.rank_entries(entries, top_n))
+    timings["extract_metadata"], _ = _best_of(
+        repeat, lambda: [thesis.extract_metadata(entry) for entry in entries])
+
+    write_articles_pdf(articles_pdf, [entry.text for entry in ranked])
+    timings["extract_matched_articles"], matched = _best_of(
+        repeat, lambda: thesis_analysis.extract_matched_articles(articles_pdf, ranked))
+    timings["analysis_metadata"], _ = _best_of(
+        repeat, lambda: [thesis_analysis.extract_metadata(entry) for entry in matched])
+
+    def plot():
+        thesis_analysis.plot_scores(matched)
+        thesis_analysis.plot_technique_trends(matched)
+        thesis_analysis.plot_privacy_accuracy(matched)
+    timings["plotting"], _ = _best_of(repeat, plot)
+
+    def save():
+        thesis.save_top_results_to_files(ranked)
+        thesis_analysis.save_analysis(matched)
+        aggregate = AnalysisAggregate.from_entries(matched)
+        thesis_analysis.compliance_analysis(aggregate)
+        thesis_analysis.save_summary(aggregate)
+    timings["saving"], _ = _best_of(repeat, save)
+
+    return {"records": count, "entries": len(entries), "matched": len(matched),
+            "seconds": timings}
+
+def compare(current, baseline):
+    """Print per-stage ratios of ``current`` against a saved baseline."""
+    for scale, result in current["results"].items():
+        base = baseline.get("results", {}).get(scale)
+        if not base:
+            print(f"{scale}: no baseline")
+            continue
+        for stage, seconds in result["seconds"].items():
+            before = base["seconds"].get(stage)
+            if before:
+                print(f"{scale:>7} {stage:<26} {before:9.4f}s -> {seconds:9.4f}s  x{seconds / before:.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every pipeline stage on synthetic exports.")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES[:3],
+                        help=f"corpus sizes in records (default: {SCALES[:3]}; up to {SCALES[-1]})")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage; the best time is kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json", help="where to save the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    output = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        # The writers use fixed file names, so keep their output out of the repo
+        os.chdir(workdir)
+        try:
+            for count in args.scales:
+                print(f"Benchmarking {count} records...")
+                results[str(count)] = bench_scale(count, workdir, args.repeat, args.seed)
+                for stage, seconds in results[str(count)]["seconds"].items():
+                    print(f"  {stage:<26} {seconds:9.4f}s")
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "pymupdf": getattr(fitz, "VersionBind", "unknown"),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": results,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved benchmark results to {output}")
+
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import sqlite3
+
+from text_cache import file_hash
+
+class PageCheckpoint:
+    """Progress of long page extractions, saved so an interrupted run can resume.
+
+    Each extracted page (or the error that made it unreadable) is stored
+    under the PDF's content hash and the extraction flags, and committed
+    every ``every`` pages. A rerun on the same file reads the saved pages
+    back and only extracts the rest. Once a document has been read to the
+    end its rows are dropped, since the ``PageTextCache`` is the place for
+    finished text.
+    """
+
+    def __init__(self, path="extraction_checkpoint.sqlite3", every=25):
+        self.path = path
+        self.every = every
+        self._pending = 0
+        # Batch mode shares one database between worker processes
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " pdf TEXT NOT NULL, flags TEXT NOT NULL, page_no INTEGER NOT NULL,"
+            " text TEXT NOT NULL, error TEXT, PRIMARY KEY (pdf, flags, page_no))"
+        )
+        self.conn.commit()
+
+    def key(self, pdf_path, flags=None):
+        """Checkpoint key of a PDF: its content hash and the extraction flags."""
+        return file_hash(pdf_path), "default" if flags is None else str(flags)
+
+    def saved_pages(self, key):
+        """Return ``{page_no: text}`` for the pages saved under ``key``."""
+        rows = self.conn.execute("SELECT page_no, text FROM pages WHERE pdf = ? AND flags = ?", key)
+        return dict(rows)
+
+    def bad_pages(self, key):
+        """Return ``{page_no: error}`` for the pages that could not be read."""
+        rows = self.conn.execute(
+            "SELECT page_no, error FROM pages WHERE pdf = ? AND flags = ? AND error IS NOT NULL", key)
+        return dict(rows)
+
+    def record(self, key, page_no, text, error=None):
+        """Save one page; committed in batches of ``every``."""
+        self.conn.execute("INSERT OR REPLACE INTO pages (pdf, flags, page_no, text, error)"
+                          " VALUES (?, ?, ?, ?, ?)", (*key, page_no, text, error))
+        self._pending += 1
+        if self._pending >= self.every:
+            self.flush()
+
+    def flush(self):
+        self.conn.commit()
+        self._pending = 0
+
+    def finish(self, key):
+        """Drop the saved pages of a document that was read to the end."""
+        bad = self.bad_pages(key)
+        if bad:
+            print(f"Skipped {len(bad)} unreadable page(s): {[page_no + 1 for page_no in sorted(bad)]}")
+        self.conn.execute("DELETE FROM pages WHERE pdf = ? AND flags = ?", key)
+        self.flush()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def __getstate__(self):
+        # Worker processes reopen the database rather than share a connection
+        return {"path": self.path, "every": self.every}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
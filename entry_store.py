@@ -0,0 +1,89 @@
+import hashlib
+import json
+import sqlite3
+
+# Bump when extract_metadata changes what it returns for the same text
+METADATA_VERSION = "2"
+
+# SQLite caps the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+def content_hash(text):
+    """Stable hash of an entry's text, used as its cache key."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+def keywords_fingerprint(keywords):
+    """Hash of the keyword list; cached scores are only valid for the same list."""
+    return hashlib.sha1("\n".join(keywords).encode("utf-8")).hexdigest()
+
+class EntryStore:
+    """Persistent per-entry results keyed by content hash.
+
+    Each row holds one kind of result ("score", "metadata", "analysis") for
+    one entry together with the version it was computed under. A lookup with
+    a different version misses, so changing ``KEYWORDS`` or a parser simply
+    recomputes and overwrites the stale rows.
+    """
+
+    def __init__(self, path="entry_cache.sqlite3"):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " hash TEXT NOT NULL, kind TEXT NOT NULL, version TEXT NOT NULL,"
+            " value TEXT NOT NULL, PRIMARY KEY (hash, kind))"
+        )
+        self.conn.commit()
+
+    def get_many(self, hashes, kind, version):
+        """Return ``{hash: value}`` for the hashes cached under ``version``."""
+        hashes = list(dict.fromkeys(hashes))
+        found = {}
+        for start in range(0, len(hashes), _QUERY_CHUNK):
+            chunk = hashes[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT hash, value FROM results WHERE kind = ? AND version = ?"
+                f" AND hash IN ({placeholders})",
+                [kind, version, *chunk],
+            )
+            for digest, value in rows:
+                found[digest] = json.loads(value)
+        return found
+
+    def put_many(self, kind, version, items):
+        """Store ``(hash, value)`` pairs, replacing rows from older versions."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results (hash, kind, version, value) VALUES (?, ?, ?, ?)",
+            [(digest, kind, version, json.dumps(value)) for digest, value in items],
+        )
+        self.conn.commit()
+
+    def cached(self, kind, version, texts, compute_batch):
+        """Return one value per text, computing only the texts not stored under ``version``.
+
+        ``compute_batch`` takes a list of texts and returns a JSON-serialisable
+        value for each. Every distinct missing text is computed once, and the
+        fresh values are stored before they are returned.
+        """
+        texts = list(texts)
+        hashes = [content_hash(text) for text in texts]
+        found = self.get_many(hashes, kind, version)
+        missing = {}
+        for text, digest in zip(texts, hashes):
+            if digest not in found:
+                missing.setdefault(digest, text)
+        if missing:
+            fresh = dict(zip(missing, compute_batch(list(missing.values()))))
+            self.put_many(kind, version, fresh.items())
+            found.update(fresh)
+        return [found[digest] for digest in hashes]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,80 @@
+import argparse
+
+from profiling import stage
+from run_context import add_common_args, metrics_from_args, open_resources
+from thesis import DEFAULT_PDF_PATH, report_top_entries, select_top_studies
+from thesis_analysis import (analysis_score, analyze_entries, extract_matched_articles,
+                             save_extracted_text)
+
+def run_pipeline(pdf_path, top_n=10, workers=1, stream=False, cache_path=None, metrics=None,
+                 scheme=None, weights=None, articles_pdf=None, save_results=False,
+                 save_text=False, plots=True, plot_workers=None, text_cache_dir=None,
+                 aggregate_path=None, checkpoint_path=None):
+    """Select the top studies and analyse them in one process.
+
+    The ranked ``Entry`` records, text included, go straight into the
+    analysis stage, so there is no results.csv to write and parse back and
+    no second search for the records. By default the signals are read from
+    each record's own text; ``articles_pdf`` instead matches the winners
+    against a full-text PDF as ``thesis_analysis`` does. ``save_results``
+    and ``save_text`` also write results.csv/results.txt and the
+    article archive. ``text_cache_dir`` names a ``PageTextCache``
+    directory used for both PDFs. The other options are those of
+    ``analyze_pdf_for_top_studies`` and ``analyze_thesis_top10``.
+    """
+    try:
+        with open_resources(cache_path, text_cache_dir, checkpoint_path, metrics) as (
+                store, text_cache, checkpoint):
+            top = select_top_studies(pdf_path, top_n, workers, stream, store, metrics, scheme,
+                                     weights, text_cache, checkpoint)
+            entries = report_top_entries(top, store, metrics, save=save_results)
+            for entry in entries:
+                entry.score = analysis_score(entry.score)
+            if articles_pdf:
+                with stage(metrics, "extraction+matching") as record:
+                    entries = extract_matched_articles(articles_pdf, entries, save_text, text_cache,
+                                                       checkpoint)
+                    record["items"] = len(entries)
+            elif save_text:
+                save_extracted_text(entries)
+            if not entries:
+                print("No entries to analyse - exiting.")
+                return []
+            return analyze_entries(entries, store, metrics, plots, plot_workers, aggregate_path)
+    except Exception as e:
+        print(f"❌ Error in run_pipeline: {e}")
+        return []
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Rank an Ex Libris export and analyse the top studies in one run.")
+    parser.add_argument("pdf_path", nargs="?", default=DEFAULT_PDF_PATH)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for page extraction (0 = every core)")
+    parser.add_argument("--stream", action="store_true", help="split and score page by page")
+    parser.add_argument("--scheme", choices=("count", "tfidf", "bm25"),
+                        help="rank with the keyword matrix under this weighting")
+    parser.add_argument("--weights", metavar="SPEC",
+                        help='per-keyword weights, e.g. "he=0,differential privacy=3"')
+    parser.add_argument("--articles", metavar="PDF",
+                        help="analyse the matching pages of this full-text PDF instead of the records")
+    parser.add_argument("--save-results", action="store_true", help="also write results.csv and results.txt")
+    parser.add_argument("--save-text", action="store_true", help="also write the article text archive")
+    parser.add_argument("--no-plots", dest="plots", action="store_false",
+                        help="skip the figures and never import matplotlib")
+    parser.add_argument("--plot-workers", type=int, default=None,
+                        help="processes rendering figures (0 = render in this process)")
+    parser.add_argument("--save-aggregate", metavar="JSON",
+                        help="save the summary statistics for merging with aggregates.py")
+    return add_common_args(parser)
+
+if __name__ == "__main__":
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    if args.stream and (args.scheme or args.weights):
+        parser.error("--stream cannot be combined with --scheme or --weights")
+    metrics = metrics_from_args(args)
+    run_pipeline(args.pdf_path, args.top_n, args.workers or None, args.stream, args.cache, metrics,
+                 args.scheme, args.weights, args.articles, args.save_results, args.save_text,
+                 args.plots, args.plot_workers, args.text_cache, args.save_aggregate,
+                 args.checkpoint)
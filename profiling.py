@@ -0,0 +1,89 @@
+import contextlib
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+class StageMetrics:
+    """Per-stage wall time, CPU time, peak memory and item counts.
+
+    Wrap each pipeline stage in ``with metrics.stage("scoring") as record:``
+    and set ``record["items"]`` to the number of things the stage handled.
+    The process-wide maximum RSS is recorded where the platform reports it.
+    With ``trace_memory`` each stage also records the tracemalloc peak of
+    the Python allocations it made; tracing hooks every allocation and can
+    slow a stage down several times over, so it is off by default and its
+    timings should not be compared with untraced ones. With ``profile_dir``
+    set, each stage also dumps a cProfile file there. The saved JSON says
+    whether either was on. Stages are not meant to be nested.
+    """
+
+    def __init__(self, path="metrics.json", profile_dir=None, trace_memory=False):
+        self.path = path
+        self.profile_dir = profile_dir
+        self.trace_memory = trace_memory
+        self.stages = []
+        if profile_dir:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        record = {"stage": name, "items": None}
+        started_tracing = False
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+            traced_before = tracemalloc.get_traced_memory()[0]
+        profiler = cProfile.Profile() if self.profile_dir else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            if self.trace_memory:
+                record["peak_memory_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - traced_before)
+                if started_tracing:
+                    tracemalloc.stop()
+            if resource is not None:
+                record["max_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if profiler:
+                profile_path = os.path.join(self.profile_dir, f"{len(self.stages):02d}_{name}.prof")
+                profiler.dump_stats(profile_path)
+                record["profile"] = profile_path
+            self.stages.append(record)
+
+    def save(self):
+        """Write the collected stages, and their totals, as JSON."""
+        report = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            # Both slow the stages down, so timings are only comparable between like runs
+            "trace_memory": self.trace_memory,
+            "profiled": bool(self.profile_dir),
+            "total_wall_seconds": sum(s["wall_seconds"] for s in self.stages),
+            "total_cpu_seconds": sum(s["cpu_seconds"] for s in self.stages),
+            "stages": self.stages,
+        }
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved stage metrics to {self.path}")
+
+def stage(metrics, name):
+    """``metrics.stage(name)``, or a no-op recorder when metrics are off."""
+    if metrics is None:
+        return contextlib.nullcontext({})
+    return metrics.stage(name)
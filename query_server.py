@@ -0,0 +1,232 @@
+import argparse
+import csv
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, urlencode
+from urllib.request import urlopen
+
+import numpy as np
+
+from ranking import SCHEMES, CorpusMatrix, parse_weights, top_n_indices
+from run_context import open_resources
+from thesis import (DEFAULT_PDF_PATH, RESULT_HEADER, Entry, dedupe_entries, expand_pdf_paths,
+                    extract_entries, extract_metadata_cached, result_row, save_top_results_to_files)
+from thesis_analysis import TECHNIQUE_PATTERNS, detect_signals_cached
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+COMPLIANCE_LABELS = ("GDPR", "HIPAA", "Generic")
+
+def _label_masks(labels, names):
+    """One boolean row mask per name, from ``"DP, HE"``-style label strings."""
+    masks = {name: np.zeros(len(labels), dtype=bool) for name in names}
+    for i, found in enumerate(labels):
+        for name in found.split(", "):
+            if name in masks:
+                masks[name][i] = True
+    return masks
+
+class QueryCorpus:
+    """Every entry of one or more exports, scored and analysed once.
+
+    Holds the entry x keyword matrix, the parsed catalogue fields and a
+    boolean mask per technique and compliance label. A query is then a
+    matrix-vector product, a few mask intersections and a partial sort, so
+    it never touches the text again.
+    """
+
+    def __init__(self, entries, matrix):
+        self.entries = entries
+        self.matrix = matrix
+        self.years = np.array([int(entry.year) if entry.year.isdigit() else 0 for entry in entries],
+                              dtype=np.int32)
+        self.technique_masks = _label_masks([entry.techniques for entry in entries], TECHNIQUE_PATTERNS)
+        self.compliance_masks = _label_masks([entry.compliance for entry in entries], COMPLIANCE_LABELS)
+
+    @classmethod
+    def from_pdfs(cls, sources, store=None, text_cache=None):
+        """Extract, deduplicate, score and analyse every entry of the given exports."""
+        texts = dedupe_entries(text for path in expand_pdf_paths(sources)
+                               for text in extract_entries(path, text_cache=text_cache))
+        matrix = CorpusMatrix.from_texts(texts, store=store)
+        entries = []
+        for text, meta, signals in zip(texts, extract_metadata_cached(texts, store),
+                                       detect_signals_cached(texts, store)):
+            entries.append(Entry(text, techniques=signals["techniques"],
+                                 compliance=signals["compliance"], **meta))
+        print(f"Loaded {len(entries)} unique entries")
+        return cls(entries, matrix)
+
+    def filter_mask(self, techniques=(), compliance=(), year_from=None, year_to=None):
+        """Rows mentioning every technique, any compliance label, within the years.
+
+        ``compliance`` may name "any" to require some compliance mention.
+        """
+        mask = np.ones(len(self.entries), dtype=bool)
+        for technique in techniques:
+            if technique not in self.technique_masks:
+                raise ValueError(f"Unknown technique: {technique!r} (expected one of {list(TECHNIQUE_PATTERNS)})")
+            mask &= self.technique_masks[technique]
+        if compliance:
+            wanted = COMPLIANCE_LABELS if "any" in compliance else compliance
+            allowed = np.zeros(len(self.entries), dtype=bool)
+            for label in wanted:
+                if label not in self.compliance_masks:
+                    raise ValueError(f"Unknown compliance label: {label!r} (expected one of {COMPLIANCE_LABELS} or 'any')")
+                allowed |= self.compliance_masks[label]
+            mask &= allowed
+        if year_from is not None:
+            mask &= self.years >= year_from
+        if year_to is not None:
+            mask &= (self.years <= year_to) & (self.years > 0)
+        return mask
+
+    def query(self, top_n=10, scheme="count", weights=None, techniques=(), compliance=(),
+              year_from=None, year_to=None):
+        """Return ranked ``Entry`` records, without text, for the matching rows."""
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown ranking scheme: {scheme!r} (expected one of {SCHEMES})")
+        rows = np.flatnonzero(self.filter_mask(techniques, compliance, year_from, year_to))
+        scores = self.matrix.scores(parse_weights(weights), scheme)[rows]
+        if scheme == "count" and np.all(np.equal(np.mod(scores, 1), 0)):
+            scores = scores.astype(np.int64)
+        ranked = []
+        for rank, i in enumerate(top_n_indices(scores, top_n), 1):
+            entry = self.entries[rows[i]]
+            ranked.append(Entry(score=scores[i].item(), rank=rank, authors=entry.authors,
+                                doi=entry.doi, publisher=entry.publisher, year=entry.year,
+                                description=entry.description, techniques=entry.techniques,
+                                compliance=entry.compliance))
+        return ranked
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "techniques": {name: int(mask.sum()) for name, mask in self.technique_masks.items()},
+            "compliance": {name: int(mask.sum()) for name, mask in self.compliance_masks.items()},
+        }
+
+def _query_args(params):
+    """Turn parsed query-string values into ``QueryCorpus.query`` arguments."""
+    def one(name, default=None, convert=str):
+        values = params.get(name)
+        return convert(values[-1]) if values else default
+    def many(name):
+        return [item for value in params.get(name, ()) for item in value.split(",") if item]
+    return {
+        "top_n": one("top_n", 10, int),
+        "scheme": one("scheme", "count"),
+        "weights": one("weights"),
+        "techniques": many("technique"),
+        "compliance": many("compliance"),
+        "year_from": one("year_from", None, int),
+        "year_to": one("year_to", None, int),
+    }
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """``GET /query?...`` returns results.csv rows as JSON; ``GET /stats`` summarises the corpus."""
+
+    corpus = None
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        try:
+            if path == "/query":
+                start = time.perf_counter()
+                ranked = self.corpus.query(**_query_args(parse_qs(query)))
+                self._send(200, {
+                    "header": RESULT_HEADER,
+                    "rows": [result_row(entry.rank, entry) for entry in ranked],
+                    "elapsed_ms": (time.perf_counter() - start) * 1000,
+                })
+            elif path == "/stats":
+                self._send(200, self.corpus.stats())
+            else:
+                self._send(404, {"error": f"Unknown path: {path}"})
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(sources, host=DEFAULT_HOST, port=DEFAULT_PORT, cache_path=None, text_cache_dir=None):
+    """Load the corpus once and answer queries until interrupted."""
+    with open_resources(cache_path, text_cache_dir) as (store, text_cache, _):
+        corpus = QueryCorpus.from_pdfs(sources, store, text_cache)
+    handler = type("Handler", (QueryHandler,), {"corpus": corpus})
+    with ThreadingHTTPServer((host, port), handler) as server:
+        print(f"Serving {len(corpus.entries)} entries on http://{host}:{port}/query")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped.")
+
+def query(url, **params):
+    """Ask a running server for results.csv rows; returns ``(header, rows)``."""
+    params = {name: ",".join(value) if isinstance(value, (list, tuple)) else value
+              for name, value in params.items() if value not in (None, [], ())}
+    try:
+        with urlopen(f"{url.rstrip('/')}/query?{urlencode(params)}") as response:
+            body = json.load(response)
+    except HTTPError as e:
+        raise ValueError(json.load(e).get("error", str(e))) from None
+    return body["header"], body["rows"]
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Keep a scored corpus in memory and answer top-N queries.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server = commands.add_parser("serve", help="load the exports and start the server")
+    server.add_argument("sources", nargs="*", default=[DEFAULT_PDF_PATH],
+                        help="PDF exports, directories or globs")
+    server.add_argument("--host", default=DEFAULT_HOST)
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    server.add_argument("--cache", metavar="DB", help="EntryStore database for incremental reloads")
+    server.add_argument("--text-cache", metavar="DIR", help="reuse extracted page text of unchanged PDFs")
+
+    client = commands.add_parser("query", help="ask a running server for the top entries")
+    client.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+    client.add_argument("--top-n", type=int, default=10)
+    client.add_argument("--scheme", choices=SCHEMES, default="count")
+    client.add_argument("--weights", metavar="SPEC",
+                        help='per-keyword weights, e.g. "he=0,differential privacy=3"')
+    client.add_argument("--technique", action="append", default=[],
+                        help=f"require this technique (repeatable; one of {', '.join(TECHNIQUE_PATTERNS)})")
+    client.add_argument("--compliance", action="append", default=[],
+                        help="require any of these compliance labels (GDPR, HIPAA, Generic or any)")
+    client.add_argument("--year-from", type=int)
+    client.add_argument("--year-to", type=int)
+    client.add_argument("--save", action="store_true", help="write results.csv and results.txt instead of printing")
+    return parser
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+    if args.command == "serve":
+        serve(args.sources, args.host, args.port, args.cache, args.text_cache)
+    else:
+        try:
+            header, rows = query(args.url, top_n=args.top_n, scheme=args.scheme, weights=args.weights,
+                                 technique=args.technique, compliance=args.compliance,
+                                 year_from=args.year_from, year_to=args.year_to)
+        except (OSError, ValueError) as e:
+            sys.exit(f"❌ Query failed: {e}")
+        if args.save:
+            save_top_results_to_files([Entry(score=row[1], authors=row[2], doi=row[3], publisher=row[4],
+                                             description=row[5]) for row in rows])
+        else:
+            writer = csv.writer(sys.stdout)
+            writer.writerow(header)
+            writer.writerows(rows)
@@ -0,0 +1,108 @@
+import numpy as np
+
+from entry_store import keywords_fingerprint
+from thesis import KEYWORD_MATCHER, RANK_BATCH_SIZE
+
+SCHEMES = ("count", "tfidf", "bm25")
+
+def parse_weights(spec, keywords=None):
+    """Parse ``"differential privacy=3,he=0"`` into a weight vector over the keywords.
+
+    Keywords not mentioned keep weight 1, so an empty spec reproduces the
+    plain hit count.
+    """
+    keywords = KEYWORD_MATCHER.keywords if keywords is None else keywords
+    index = {keyword: i for i, keyword in enumerate(keywords)}
+    weights = np.ones(len(keywords))
+    for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+        keyword, _, value = item.rpartition("=")
+        keyword = keyword.strip().lower()
+        if keyword not in index:
+            raise ValueError(f"Unknown keyword in weights: {keyword!r}")
+        weights[index[keyword]] = float(value)
+    return weights
+
+def top_n_indices(scores, top_n):
+    """Indices of the ``top_n`` highest scores, best first, ties in document order.
+
+    ``argpartition`` finds the cut-off in linear time; only the rows at or
+    above it are sorted, and rows tied at the cut-off are taken in order so
+    the result matches a stable descending sort.
+    """
+    count = len(scores)
+    if top_n is None or top_n >= count:
+        return np.argsort(-scores, kind="stable")
+    if top_n <= 0:
+        return np.empty(0, dtype=np.intp)
+    threshold = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+    above = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:top_n - len(above)]
+    chosen = np.concatenate([above, tied])
+    return chosen[np.argsort(-scores[chosen], kind="stable")]
+
+def _counts_batch(batch, matcher, store=None):
+    """Per-keyword counts for a batch, only scanning entries missing from ``store``."""
+    if store is None:
+        return matcher.counts_batch(batch)
+    return store.cached("counts", keywords_fingerprint(matcher.keywords), batch, matcher.counts_batch)
+
+class CorpusMatrix:
+    """Entry x keyword hit-count matrix built in one scan of the corpus.
+
+    Once built, any weighting can be applied with a few array operations, so
+    re-ranking under new keyword weights or another scheme never touches the
+    text again.
+    """
+
+    def __init__(self, texts, counts, lengths):
+        self.texts = texts
+        self.counts = counts
+        self.lengths = lengths
+
+    @classmethod
+    def from_texts(cls, texts, matcher=KEYWORD_MATCHER, store=None):
+        """Build the matrix; with an ``EntryStore`` only new or changed texts are scanned."""
+        texts = list(texts)
+        counts = np.zeros((len(texts), len(matcher.keywords)), dtype=np.int32)
+        for start in range(0, len(texts), RANK_BATCH_SIZE):
+            batch = texts[start:start + RANK_BATCH_SIZE]
+            counts[start:start + len(batch)] = _counts_batch(batch, matcher, store)
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.float64, count=len(texts))
+        return cls(texts, counts, lengths)
+
+    def idf(self, smooth=True):
+        """Inverse document frequency of each keyword across the entries."""
+        n = len(self.texts)
+        df = np.count_nonzero(self.counts, axis=0)
+        if smooth:
+            return np.log((1 + n) / (1 + df)) + 1
+        return np.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def scores(self, weights=None, scheme="count", k1=1.2, b=0.75):
+        """Score every entry.
+
+        ``count`` is the weighted hit count (all-ones weights give
+        ``keyword_score``), ``tfidf`` damps keywords that occur in most
+        entries, and ``bm25`` also saturates repeated hits and normalises by
+        entry length.
+        """
+        if weights is None:
+            weights = np.ones(self.counts.shape[1])
+        if scheme == "count":
+            return self.counts @ weights
+        if scheme == "tfidf":
+            return self.counts @ (self.idf() * weights)
+        if scheme == "bm25":
+            if not len(self.texts):
+                return np.zeros(0)
+            norm = k1 * (1 - b + b * self.lengths / self.lengths.mean())
+            tf = self.counts * (k1 + 1) / (self.counts + norm[:, None])
+            return tf @ (self.idf(smooth=False) * weights)
+        raise ValueError(f"Unknown ranking scheme: {scheme!r} (expected one of {SCHEMES})")
+
+    def top(self, top_n=10, weights=None, scheme="count"):
+        """Return the ``top_n`` best ``(text, score)`` pairs, like ``select_top_entries``."""
+        scores = self.scores(weights, scheme)
+        if scheme == "count" and np.all(np.equal(np.mod(scores, 1), 0)):
+            scores = scores.astype(np.int64)
+        return [(self.texts[i], scores[i].item()) for i in top_n_indices(scores, top_n)]
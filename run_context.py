@@ -0,0 +1,40 @@
+import contextlib
+
+from checkpoint import PageCheckpoint
+from entry_store import EntryStore
+from profiling import StageMetrics
+from text_cache import PageTextCache
+
+def add_common_args(parser):
+    """Add the cache, checkpoint and metrics options every pipeline script takes."""
+    parser.add_argument("--cache", metavar="DB", help="EntryStore database for incremental reruns")
+    parser.add_argument("--text-cache", metavar="DIR", help="reuse extracted page text of unchanged PDFs")
+    parser.add_argument("--checkpoint", metavar="DB", help="save extraction progress here and resume from it")
+    parser.add_argument("--metrics", metavar="JSON", help="write per-stage time/memory metrics here")
+    parser.add_argument("--profile-dir", metavar="DIR", help="also dump a cProfile file per stage")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record each stage's peak Python memory (slows the stages down)")
+    return parser
+
+def metrics_from_args(args):
+    """The ``StageMetrics`` the metrics options ask for, or None when they are all off."""
+    if args.metrics or args.profile_dir or args.trace_memory:
+        return StageMetrics(args.metrics or "metrics.json", args.profile_dir, args.trace_memory)
+    return None
+
+@contextlib.contextmanager
+def open_resources(cache_path=None, text_cache_dir=None, checkpoint_path=None, metrics=None):
+    """Open a run's optional stores and close them, saving ``metrics``, when it ends.
+
+    Yields ``(store, text_cache, checkpoint)``: an ``EntryStore``, a
+    ``PageTextCache`` and a ``PageCheckpoint``, each None when its path is
+    not given. Everything is closed and the metrics saved even if the run
+    fails.
+    """
+    with contextlib.ExitStack() as stack:
+        if metrics is not None:
+            stack.callback(metrics.save)
+        store = stack.enter_context(EntryStore(cache_path)) if cache_path else None
+        text_cache = PageTextCache(text_cache_dir) if text_cache_dir else None
+        checkpoint = stack.enter_context(PageCheckpoint(checkpoint_path)) if checkpoint_path else None
+        yield store, text_cache, checkpoint
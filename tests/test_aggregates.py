@@ -0,0 +1,59 @@
+import json
+import random
+
+from aggregates import AnalysisAggregate, aggregate_in_processes, merge_aggregates
+from thesis import Entry
+
+TECHNIQUES = ["DP", "HE", "SMPC", "TEE", "Blockchain", "Hybrid"]
+COMPLIANCE = ["GDPR", "HIPAA", "Generic"]
+
+def _random_entries(count, seed=7):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        techniques = rng.sample(TECHNIQUES, rng.randint(0, 3))
+        compliance = rng.sample(COMPLIANCE, rng.randint(0, 2))
+        # Count scores tie often; BM25-style fractional scores exercise the exact sum
+        score = float(rng.randint(0, 40)) if rng.random() < 0.5 else rng.uniform(0, 40)
+        entries.append(Entry(
+            score=score, authors=f"Author {i}", publisher=rng.choice(["IEEE", "MDPI AG", "Unknown"]),
+            year=str(rng.randint(2015, 2025)) if rng.random() < 0.9 else "Unknown",
+            techniques=", ".join(techniques) or "None", compliance=", ".join(compliance) or "None",
+            accuracy=rng.choice(["Not stated", "93.22%"])))
+    return entries
+
+def _random_shards(entries, rng):
+    cuts = sorted(rng.sample(range(1, len(entries)), rng.randint(1, 20)))
+    return [entries[start:stop] for start, stop in zip([0] + cuts, cuts + [len(entries)])]
+
+def test_merged_shards_match_single_pass():
+    entries = _random_entries(1000)
+    expected = AnalysisAggregate.from_entries(entries).to_dict()
+    rng = random.Random(11)
+    for _ in range(20):
+        shards = _random_shards(entries, rng)
+        merged = merge_aggregates(AnalysisAggregate.from_entries(shard) for shard in shards)
+        assert merged.to_dict() == expected
+
+def test_json_round_trip_per_shard():
+    entries = _random_entries(1000)
+    expected = AnalysisAggregate.from_entries(entries)
+    shards = _random_shards(entries, random.Random(3))
+    restored = [AnalysisAggregate.from_dict(json.loads(json.dumps(AnalysisAggregate.from_entries(shard).to_dict())))
+                for shard in shards]
+    merged = merge_aggregates(restored)
+    assert merged.to_dict() == expected.to_dict()
+    assert merged.mean_score == expected.mean_score
+    assert merged.compliance_stats() == expected.compliance_stats()
+
+def test_save_and_load(tmp_path):
+    aggregate = AnalysisAggregate.from_entries(_random_entries(50))
+    path = tmp_path / "shard.json"
+    aggregate.save(path)
+    assert AnalysisAggregate.load(path).to_dict() == aggregate.to_dict()
+
+def test_aggregate_in_processes_matches_single_pass():
+    entries = _random_entries(1000)
+    expected = AnalysisAggregate.from_entries(entries).to_dict()
+    assert aggregate_in_processes(entries, workers=2, shard_size=137).to_dict() == expected
+    assert aggregate_in_processes(entries, workers=1, shard_size=137).to_dict() == expected
@@ -0,0 +1,64 @@
+from article_archive import ArticleArchive, ArticleArchiveWriter
+from thesis import Entry
+
+def _write_archive(path, count=10):
+    with ArticleArchiveWriter(str(path)) as writer:
+        for rank in range(1, count + 1):
+            writer.append(Entry(f"Article {rank} text " * 50, score=float(rank), rank=rank,
+                                authors=f"Author {rank}", doi=f"10.1000/test.{rank}"))
+
+def test_lookup_by_rank_and_doi(tmp_path):
+    path = tmp_path / "articles.zarc"
+    _write_archive(path)
+    with ArticleArchive(str(path)) as archive:
+        assert len(archive) == 10
+        assert archive.get(rank=4).authors == "Author 4"
+        assert archive.get(doi="10.1000/TEST.7").text.startswith("Article 7 text")
+        assert archive.get(rank=11) is None
+
+def test_index_missing_last_lines_is_rebuilt(tmp_path):
+    path = tmp_path / "articles.zarc"
+    _write_archive(path)
+    index = tmp_path / "articles.zarc.idx"
+    lines = index.read_text(encoding="utf-8").splitlines(keepends=True)
+    index.write_text("".join(lines[:-3]), encoding="utf-8")
+    with ArticleArchive(str(path)) as archive:
+        assert len(archive) == 10
+        assert archive.get(rank=10).authors == "Author 10"
+
+def test_missing_index_is_rebuilt(tmp_path):
+    path = tmp_path / "articles.zarc"
+    _write_archive(path)
+    (tmp_path / "articles.zarc.idx").unlink()
+    with ArticleArchive(str(path)) as archive:
+        assert [entry.rank for entry in archive] == list(range(1, 11))
+
+def test_truncated_archive_keeps_complete_records(tmp_path):
+    path = tmp_path / "articles.zarc"
+    _write_archive(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    with ArticleArchive(str(path)) as archive:
+        assert len(archive) == 9
+        assert archive.get(rank=10) is None
+        assert archive.get(rank=9).authors == "Author 9"
+
+def test_index_missing_a_middle_line_is_rebuilt(tmp_path):
+    path = tmp_path / "articles.zarc"
+    _write_archive(path)
+    index = tmp_path / "articles.zarc.idx"
+    lines = index.read_text(encoding="utf-8").splitlines(keepends=True)
+    for dropped in (0, 2):
+        index.write_text("".join(lines[:dropped] + lines[dropped + 1:]), encoding="utf-8")
+        with ArticleArchive(str(path)) as archive:
+            assert len(archive) == 10
+            assert archive.get(rank=dropped + 1).authors == f"Author {dropped + 1}"
+
+def test_index_with_reordered_lines_is_rebuilt(tmp_path):
+    path = tmp_path / "articles.zarc"
+    _write_archive(path)
+    index = tmp_path / "articles.zarc.idx"
+    lines = index.read_text(encoding="utf-8").splitlines(keepends=True)
+    index.write_text("".join([lines[1], lines[0]] + lines[2:]), encoding="utf-8")
+    with ArticleArchive(str(path)) as archive:
+        assert [entry.rank for entry in archive] == list(range(1, 11))
@@ -0,0 +1,69 @@
+import random
+import re
+
+from thesis_analysis import (ACCURACY_PATTERNS, COMPLIANCE_PHRASES, GDPR_PHRASES, HIPAA_PHRASES,
+                             PRIVACY_PATTERNS, TECHNIQUE_PATTERNS, YEAR_PATTERN, detect_signals)
+
+def _original_signals(text):
+    """The per-pattern searches ``detect_signals`` replaced, with their original flags."""
+    techniques = [tech for tech, pattern in TECHNIQUE_PATTERNS.items()
+                  if re.search(pattern, text, re.IGNORECASE)]
+    lowered = text.lower()
+    compliance = []
+    if any(re.search(phrase, lowered) for phrase in GDPR_PHRASES):
+        compliance.append('GDPR')
+    if any(re.search(phrase, lowered) for phrase in HIPAA_PHRASES):
+        compliance.append('HIPAA')
+    if not compliance and any(re.search(phrase, lowered) for phrase in COMPLIANCE_PHRASES):
+        compliance.append('Generic')
+    accuracy = "Not stated"
+    for pattern in ACCURACY_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            accuracy = match.group(2)
+            if not accuracy.endswith('%'):
+                accuracy = f"{float(accuracy)*100:.2f}%"
+            break
+    privacy_level = "Unknown"
+    for pattern in PRIVACY_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            privacy_level = match.group(2)
+            break
+    if privacy_level == "Unknown" and 'DP' in techniques:
+        privacy_level = "1.0"
+    elif privacy_level == "Unknown":
+        privacy_level = "10.0"
+    year = re.search(YEAR_PATTERN, text)
+    return {
+        "techniques": ', '.join(techniques) if techniques else 'None',
+        "compliance": ', '.join(compliance) if compliance else 'None',
+        "accuracy": accuracy,
+        "privacy_level": privacy_level,
+        "year": year.group(1) if year else "Unknown",
+    }
+
+# Phrases the patterns look for, plus characters whose lowercase form
+# changes length or word class
+PIECES = ["Differential Privacy", "DP", "HE", "homomorphic encryption", "SMPC", "TEE",
+          "Blockchain", "hybrid", "GDPR", "HIPAA", "compliant with", "accuracy", "AUC", "F1",
+          "epsilon", "ε", "Privacy Budget", "noise scale", "93.22%", "0.93", "1.0", "3", "2021",
+          ":", "=", " ", "\n", "İ", "ẞ", "K", "Σ", "ﬁ", "_", "-"]
+
+def _outcome(detect, text):
+    # Both versions share the original quirks, including the ones that raise
+    try:
+        return detect(text)
+    except Exception as e:
+        return type(e)
+
+def test_matches_original_searches_on_random_text():
+    rng = random.Random(42)
+    for _ in range(20000):
+        text = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 12)))
+        assert _outcome(detect_signals, text) == _outcome(_original_signals, text), text
+
+def test_dotted_capital_i_keeps_word_boundaries():
+    # "İ".lower() adds U+0307, which would put a \b between "3" and " epsilon"
+    assert detect_signals("İ3 epsilon") == _original_signals("İ3 epsilon")
+    assert detect_signals("İ3 epsilon")["privacy_level"] == "10.0"
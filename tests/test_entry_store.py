@@ -0,0 +1,18 @@
+from entry_store import EntryStore
+
+def test_cached_computes_each_missing_text_once(tmp_path):
+    calls = []
+    def compute(texts):
+        calls.append(list(texts))
+        return [len(text) for text in texts]
+
+    with EntryStore(str(tmp_path / "cache.sqlite3")) as store:
+        assert store.cached("length", "1", ["aa", "b", "aa"], compute) == [2, 1, 2]
+        assert calls == [["aa", "b"]]
+        assert store.cached("length", "1", ["b", "ccc", "aa"], compute) == [1, 3, 2]
+        assert calls[-1] == ["ccc"]
+        # Another version misses and recomputes
+        assert store.cached("length", "2", ["aa"], compute) == [2]
+        assert calls[-1] == ["aa"]
+        assert store.cached("length", "2", [], compute) == []
+        assert len(calls) == 3
@@ -0,0 +1,45 @@
+import re
+import time
+
+import pytest
+
+import benchmark
+from thesis import extract_metadata, split_fields
+
+def regex_metadata(entry):
+    """The original per-field regex extraction, kept as the reference."""
+    metadata = {}
+    author_match = re.search(r'Author:\s*(.+?)\s*(?=Subject:|Is Part Of:|Description:|$)', entry, re.DOTALL)
+    metadata["authors"] = author_match.group(1).strip() if author_match else "Unknown"
+    doi_match = re.search(r'(10\.\d{4,9}/[^\s";]+)', entry)
+    metadata["doi"] = doi_match.group(1) if doi_match else "Unknown"
+    publisher_match = re.search(r'Publisher:\s*(.+)', entry)
+    metadata["publisher"] = publisher_match.group(1).strip() if publisher_match else "Unknown"
+    year_match = re.search(r'(\b20[1-2][0-9]\b)', entry)
+    metadata["year"] = year_match.group(1) if year_match else "Unknown"
+    desc_match = re.search(r'(Description|Abstract):\s*(.+?)(?=\n[A-Z][a-z]+:|$)', entry, re.DOTALL)
+    metadata["description"] = desc_match.group(2).strip() if desc_match else "No description found"
+    return metadata
+
+WELL_FORMED = benchmark.make_records(300) + [
+    "Author: Lee, Soyoung\nIs Part Of: IEEE Access, 2022\nAbstract: Federated learning\n"
+    "across hospitals, wrapped over\ntwo lines.\nPublisher: IEEE\nIdentifier: DOI: 10.1109/x.1\n",
+    "Author: Park, Eman ;\n  Zhao, Leroy\nSubject: Privacy\nDescription: Short.\n"
+    "Publisher: MDPI AG\nDOI: 10.3390/abc\n",
+    "Title only, no labelled fields and no year\n",
+]
+
+@pytest.mark.parametrize("entry", WELL_FORMED)
+def test_extract_metadata_matches_original_regexes(entry):
+    assert extract_metadata(entry) == regex_metadata(entry)
+
+def test_split_fields_keeps_wrapped_values():
+    fields = split_fields("junk\nAuthor: A\n B\nIs Part Of: J\nAuthor: again")
+    assert fields == {"Author": "A\n B", "Is Part Of": "J"}
+
+def test_whitespace_runs_take_linear_time():
+    # The original author pattern backtracks quadratically over these runs
+    entry = "Author: a" + " \n" * 200000 + "x"
+    start = time.perf_counter()
+    assert extract_metadata(entry)["authors"].startswith("a")
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,42 @@
+import random
+
+from thesis import KEYWORDS, KEYWORD_MATCHER, keyword_score, keyword_scores
+
+def _random_text(rng):
+    """Keyword fragments, whole keywords and noise, in mixed case."""
+    pieces = []
+    for _ in range(rng.randint(0, 12)):
+        keyword = rng.choice(KEYWORDS)
+        choice = rng.random()
+        if choice < 0.4:
+            pieces.append(keyword)
+        elif choice < 0.7:
+            cut = rng.randint(0, len(keyword))
+            pieces.append(keyword[:cut] if rng.random() < 0.5 else keyword[cut:])
+        else:
+            pieces.append("".join(rng.choice("aefhlpdtx -") for _ in range(rng.randint(1, 6))))
+    text = rng.choice(["", " ", "\n"]).join(pieces)
+    return "".join(char.upper() if rng.random() < 0.2 else char for char in text)
+
+def test_counts_match_str_count_on_random_text():
+    rng = random.Random(1234)
+    texts = [_random_text(rng) for _ in range(20000)]
+    expected = [[text.lower().count(keyword) for keyword in KEYWORDS] for text in texts]
+    assert [KEYWORD_MATCHER.counts(text) for text in texts] == expected
+    assert KEYWORD_MATCHER.counts_batch(texts) == expected
+    assert keyword_scores(texts) == [sum(counts) for counts in expected]
+    assert [keyword_score(text) for text in texts] == [sum(counts) for counts in expected]
+
+def test_overlapping_and_nested_keywords():
+    # "poisoning" also contains "poisoning" inside "data poisoning"; "he" sits in "homomorphic encryption"
+    text = "Data Poisoning and poisoning; the HE scheme. dpdp fl fl"
+    counts = dict(zip(KEYWORDS, KEYWORD_MATCHER.counts(text)))
+    assert counts["data poisoning"] == 1
+    assert counts["poisoning"] == 2
+    assert counts["he"] == text.lower().count("he")
+    assert counts["dp"] == 2
+    assert counts["fl"] == 2
+
+def test_empty_batch():
+    assert keyword_scores([]) == []
+    assert KEYWORD_MATCHER.counts_batch([]) == []
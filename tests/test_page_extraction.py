@@ -0,0 +1,67 @@
+import fitz  # PyMuPDF
+import pytest
+
+import benchmark
+from checkpoint import PageCheckpoint
+from text_cache import PageTextCache
+from thesis import extract_page_texts, iter_page_texts, rank_entries
+from thesis_analysis import PageIndex, extract_matched_articles
+
+BAD_PAGE = 3
+
+@pytest.fixture
+def articles(tmp_path):
+    records = benchmark.make_records(10)
+    path = str(tmp_path / "articles.pdf")
+    benchmark.write_articles_pdf(path, records)
+    return path, rank_entries(records, top_n=None)
+
+@pytest.fixture
+def unreadable_page(monkeypatch):
+    """Make one page raise in get_text, as a damaged page would."""
+    get_text = fitz.Page.get_text
+    def failing_get_text(page, *args, **kwargs):
+        if page.number == BAD_PAGE:
+            raise RuntimeError("damaged content stream")
+        return get_text(page, *args, **kwargs)
+    monkeypatch.setattr(fitz.Page, "get_text", failing_get_text)
+    return monkeypatch
+
+@pytest.mark.parametrize("use_cache", [False, True])
+@pytest.mark.parametrize("use_checkpoint", [False, True])
+def test_unreadable_page_is_skipped(tmp_path, articles, unreadable_page, use_cache, use_checkpoint):
+    pdf_path, ranked = articles
+    expected = extract_matched_articles(pdf_path, ranked, False)
+    assert len(expected) >= 9
+    text_cache = PageTextCache(str(tmp_path / "cache")) if use_cache else None
+    checkpoint = PageCheckpoint(str(tmp_path / "checkpoint.sqlite3")) if use_checkpoint else None
+    try:
+        matched = extract_matched_articles(pdf_path, ranked, False, text_cache, checkpoint)
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    # Neither the cache nor the checkpoint turns one damaged page into a failed run
+    assert [entry.doi for entry in matched] == [entry.doi for entry in expected]
+
+def test_pages_with_errors_are_not_cached(tmp_path, articles, unreadable_page):
+    pdf_path, _ = articles
+    text_cache = PageTextCache(str(tmp_path / "cache"))
+    bad_pages = []
+    pages = extract_page_texts(pdf_path, text_cache=text_cache, bad_pages=bad_pages)
+    assert pages[BAD_PAGE] == "" and bad_pages == [BAD_PAGE]
+    assert text_cache.load(pdf_path) is None
+
+    # Once the page reads again, the retry fills it in and is cached
+    unreadable_page.undo()
+    pages = extract_page_texts(pdf_path, text_cache=text_cache)
+    assert pages[BAD_PAGE]
+    with text_cache.load(pdf_path) as cached:
+        assert list(cached) == pages
+
+def test_cached_index_matches_uncached(tmp_path, articles):
+    pdf_path, _ = articles
+    text_cache = PageTextCache(str(tmp_path / "cache"))
+    expected = PageIndex.from_pdf(pdf_path).texts
+    assert PageIndex.from_pdf(pdf_path, text_cache).texts == expected
+    assert PageIndex.from_pdf(pdf_path, text_cache).texts == expected
+    assert list(iter_page_texts(pdf_path, text_cache)) == extract_page_texts(pdf_path)
@@ -0,0 +1,27 @@
+from thesis_analysis import PageIndex
+
+PAGES = [
+    "Front matter about Blockchains and ledgers",
+    "Smith wrote about Blockchain things",
+    "Jones: Federated learn-\n  ing for secure health data",
+    "Brown on Differential\nPrivacy in practice",
+]
+
+def test_one_word_title_matches_the_word():
+    index = PageIndex(["Nothing here", "Smith wrote about Blockchain things"])
+    assert index.find_author_title("Smith", ["Blockchain"]) == (1, 3)
+    # Whole words only, and no author bonus without the author
+    assert PageIndex(PAGES).find_author_title("Nobody", ["Blockchain"]) == (1, 2)
+    assert index.find_author_title("Smith", ["Ledger"]) is None
+
+def test_hyphen_wrapped_title_matches():
+    index = PageIndex(PAGES)
+    assert index.find_author_title("Jones", "Federated learning for secure".split()) == (2, 3)
+
+def test_line_wrapped_title_matches():
+    index = PageIndex(PAGES)
+    assert index.find_author_title("Brown", ["Differential", "Privacy"]) == (3, 3)
+    assert index.find_author_title("Brown", ["Differential", "Learning"]) is None
+
+def test_empty_title_matches_nothing():
+    assert PageIndex(PAGES).find_author_title("Smith", ["1234"]) is None
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from ranking import top_n_indices
+
+def stable_top(scores, top_n):
+    order = sorted(range(len(scores)), key=lambda i: -scores[i])
+    return order if top_n is None else order[:max(top_n, 0)]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_top_n_indices_matches_stable_sort_with_ties(seed):
+    rng = np.random.default_rng(seed)
+    size = int(rng.integers(0, 60))
+    # Few distinct values so most scores are tied, including at the cut-off
+    scores = rng.integers(0, 4, size).astype(np.float64)
+    for top_n in [None, 0, 1, 2, size // 2, size - 1, size, size + 5]:
+        assert top_n_indices(scores, top_n).tolist() == stable_top(scores.tolist(), top_n)
+
+def test_top_n_indices_edge_cases():
+    scores = np.array([1.0, 3.0, 3.0, 2.0, 3.0])
+    assert top_n_indices(scores, 0).tolist() == []
+    assert top_n_indices(scores, -1).tolist() == []
+    assert top_n_indices(scores, 2).tolist() == [1, 2]
+    assert top_n_indices(scores, None).tolist() == [1, 2, 4, 3, 0]
+    assert top_n_indices(scores, 100).tolist() == [1, 2, 4, 3, 0]
+    assert top_n_indices(np.zeros(0), 3).tolist() == []
+    assert top_n_indices(np.full(6, 7.0), 4).tolist() == [0, 1, 2, 3]
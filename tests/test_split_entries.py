@@ -0,0 +1,35 @@
+import random
+
+import benchmark
+from thesis import ENTRY_SEPARATOR, split_entries, split_entries_stream
+
+def _corpus(count=6, seed=5):
+    return "\n".join(benchmark.make_records(count, seed))
+
+def _check(pages):
+    assert list(split_entries_stream(pages)) == split_entries("\n".join(pages))
+
+def test_separator_split_at_every_page_join_offset():
+    text = _corpus()
+    pos = text.find(ENTRY_SEPARATOR)
+    assert pos != -1
+    while pos != -1:
+        # Cut just before, inside and just after "\nAuthor:"
+        for cut in range(pos - 2, pos + len(ENTRY_SEPARATOR) + 2):
+            _check([text[:cut], text[cut:]])
+        pos = text.find(ENTRY_SEPARATOR, pos + 1)
+
+def test_records_spanning_several_pages():
+    text = _corpus(20)
+    rng = random.Random(9)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 60)))
+        _check([text[start:stop] for start, stop in zip([0] + cuts, cuts + [len(text)])])
+    # Pages shorter than the separator, and empty pages
+    _check([text[i:i + 3] for i in range(0, len(text), 3)])
+    _check(["", text[:500], "", text[500:], ""])
+
+def test_edge_inputs():
+    _check([])
+    _check([""])
+    _check(["Author: too short"])
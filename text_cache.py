@@ -0,0 +1,155 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import fitz  # PyMuPDF
+
+# File layout: MAGIC | UTF-8 page texts | count+1 uint64 offsets | uint64 count | MAGIC.
+# Offsets trail the payload so pages can be appended while they are extracted.
+MAGIC = b"PGTEXT01"
+_COUNT = struct.Struct("<Q")
+_HASH_BLOCK = 1 << 20
+
+def file_hash(path):
+    """SHA-1 of a file's bytes, read in blocks."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class CachedPages:
+    """Read-only page texts backed by a memory-mapped cache file.
+
+    Pages are sliced straight out of the mapping and decoded on access, so
+    opening a cached document reads nothing but its offset table.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise
+        size = len(self._map)
+        tail = size - len(MAGIC) - _COUNT.size
+        if size < 2 * len(MAGIC) + _COUNT.size or self._map[:len(MAGIC)] != MAGIC \
+                or self._map[size - len(MAGIC):] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a page text cache: {path}")
+        (count,) = _COUNT.unpack_from(self._map, tail)
+        self._offsets = array("Q")
+        self._offsets.frombytes(self._map[tail - 8 * (count + 1):tail])
+        if sys.byteorder != "little":
+            self._offsets.byteswap()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, page_no):
+        if page_no < 0:
+            page_no += len(self)
+        if not 0 <= page_no < len(self):
+            raise IndexError("page number out of range")
+        start, end = self._offsets[page_no], self._offsets[page_no + 1]
+        with memoryview(self._map) as view:
+            return str(view[start:end], "utf-8", "surrogatepass")
+
+    def __iter__(self):
+        for page_no in range(len(self)):
+            yield self[page_no]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class PageTextCache:
+    """Extracted page text on disk, keyed by the PDF's content and extraction flags.
+
+    A PDF is identified by the hash of its bytes, so a renamed copy still
+    hits and an edited file misses. The key also holds the ``get_text``
+    flags and the PyMuPDF version, since both change the text produced.
+    Entries are written to a temporary file and renamed into place, so a
+    crash never leaves a truncated cache behind.
+    """
+
+    def __init__(self, directory=".page_text_cache"):
+        self.directory = directory
+        self._hashes = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _pdf_hash(self, pdf_path):
+        """Hash of the PDF, remembered per (path, size, mtime) for this process."""
+        stat = os.stat(pdf_path)
+        key = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = file_hash(pdf_path)
+        return self._hashes[key]
+
+    def path_for(self, pdf_path, flags=None):
+        flag_key = "default" if flags is None else str(flags)
+        version = getattr(fitz, "VersionBind", "unknown")
+        return os.path.join(self.directory, f"{self._pdf_hash(pdf_path)}-{flag_key}-{version}.pages")
+
+    def load(self, pdf_path, flags=None):
+        """Return ``CachedPages`` for the PDF, or None when it is not cached."""
+        path = self.path_for(pdf_path, flags)
+        try:
+            return CachedPages(path)
+        except (OSError, ValueError):
+            return None
+
+    def iter_pages(self, pdf_path, flags=None, *, extract, bad_pages=None):
+        """Yield page texts from the cache, extracting and caching them on a miss.
+
+        ``extract(pdf_path, bad_pages)`` returns an iterable of page texts and
+        appends the number of every page it could not read to ``bad_pages``.
+        Pages are written to the cache file as they are yielded, but a
+        document with unreadable pages is not cached, so the next run tries
+        those pages again instead of reading back empty text. Pass a
+        ``bad_pages`` list to see which pages those were.
+        """
+        cached = self.load(pdf_path, flags)
+        if cached is not None:
+            with cached:
+                yield from cached
+            return
+        path = self.path_for(pdf_path, flags)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        offsets = array("Q", [len(MAGIC)])
+        bad_pages = [] if bad_pages is None else bad_pages
+        known_bad = len(bad_pages)
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC)
+                for text in extract(pdf_path, bad_pages):
+                    data = text.encode("utf-8", "surrogatepass")
+                    f.write(data)
+                    offsets.append(offsets[-1] + len(data))
+                    yield text
+                if sys.byteorder != "little":
+                    offsets.byteswap()
+                f.write(offsets.tobytes())
+                f.write(_COUNT.pack(len(offsets) - 1))
+                f.write(MAGIC)
+            if len(bad_pages) > known_bad:
+                print(f"Not caching {pdf_path}: {len(bad_pages) - known_bad} unreadable page(s) will be retried")
+            else:
+                os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def page_texts(self, pdf_path, flags=None, *, extract, bad_pages=None):
+        """Return every page text as a list, via ``iter_pages``."""
+        return list(self.iter_pages(pdf_path, flags, extract=extract, bad_pages=bad_pages))
@@ -1,7 +1,16 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import argparse
 import fitz  # PyMuPDF
+import glob
+import heapq
+import os
 import re
 import csv
+from functools import partial
+from entry_store import METADATA_VERSION, content_hash, keywords_fingerprint
+from profiling import stage
+from run_context import add_common_args, metrics_from_args, open_resources
 
 # Step 1: Define relevant keywords
 KEYWORDS = [
@@ -18,110 +27,602 @@ KEYWORDS = [
     "backdoor", "poisoning"
 ]
 
+class KeywordMatcher:
+    """Count every keyword of a vocabulary in lowercased text.
+
+    Each text is lowercased once and every keyword is counted on that copy
+    with ``str.count``. Its C search loop skips ahead through the text, so
+    48 of them beat a single pass in Python, and a regex alternation, which
+    tries every branch at every character. Counts are non-overlapping per
+    keyword, as ``str.count`` defines them.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+
+    def counts(self, text):
+        """Return a list of hit counts aligned with ``self.keywords``."""
+        text = text.lower()
+        return [text.count(keyword) for keyword in self.keywords]
+
+    def counts_batch(self, texts):
+        """Return per-keyword hit counts for every text."""
+        return [self.counts(text) for text in texts]
+
+    def score(self, text):
+        """Return the total number of keyword hits in ``text``."""
+        text = text.lower()
+        return sum(text.count(keyword) for keyword in self.keywords)
+
+    def score_batch(self, texts):
+        """Return the total number of keyword hits for every text."""
+        return [self.score(text) for text in texts]
+
+KEYWORD_MATCHER = KeywordMatcher(KEYWORDS)
+
 def keyword_score(text):
     """Count keyword hits in a chunk of text."""
     try:
-        text = text.lower()
-        return sum(text.count(keyword) for keyword in KEYWORDS)
+        return KEYWORD_MATCHER.score(text)
     except Exception as e:
         print(f"Error in keyword_score: {e}")
         return 0
 
+def keyword_scores(texts):
+    """Count keyword hits for a whole list of texts."""
+    try:
+        return KEYWORD_MATCHER.score_batch(texts)
+    except Exception as e:
+        print(f"Error in keyword_scores: {e}")
+        return [0] * len(texts)
+
 # Step 2: Extract entries
-def extract_entries(pdf_path):
+def read_page_text(doc, page_no, flags=None):
+    """Return ``(text, error)`` for one page; an unreadable page is logged and gives ``""``."""
+    try:
+        page = doc.load_page(page_no)
+        return (page.get_text() if flags is None else page.get_text("text", flags=flags)), None
+    except Exception as e:
+        print(f"⚠️ Skipping unreadable page {page_no + 1} of {doc.name}: {e}")
+        return "", str(e)
+
+def iter_checkpointed_pages(pdf_path, checkpoint, flags=None, bad_pages=None):
+    """Yield every page text, reading pages saved in a ``PageCheckpoint`` and saving the rest.
+
+    The checkpoint is cleared only once the last page has been yielded, so
+    an interrupted run picks up where it stopped. The numbers of unreadable
+    pages, restored or new, are appended to ``bad_pages`` when given.
+    """
+    key = checkpoint.key(pdf_path, flags)
+    saved = checkpoint.saved_pages(key)
+    if saved:
+        print(f"Resuming {pdf_path}: {len(saved)} page(s) restored from checkpoint")
+        if bad_pages is not None:
+            bad_pages.extend(checkpoint.bad_pages(key))
+    doc = fitz.open(pdf_path)
+    try:
+        for page_no in range(doc.page_count):
+            if page_no in saved:
+                yield saved.pop(page_no)
+                continue
+            text, error = read_page_text(doc, page_no, flags)
+            checkpoint.record(key, page_no, text, error)
+            if error is not None and bad_pages is not None:
+                bad_pages.append(page_no)
+            yield text
+    finally:
+        doc.close()
+        checkpoint.flush()
+    checkpoint.finish(key)
+
+def _extract_page_range(task):
+    """Extract pages ``[start, stop)`` in a worker with its own document handle."""
+    pdf_path, start, stop = task
+    doc = fitz.open(pdf_path)
+    try:
+        return [read_page_text(doc, page_no) for page_no in range(start, stop)]
+    finally:
+        doc.close()
+
+def extract_page_texts(pdf_path, workers=1, text_cache=None, checkpoint=None, bad_pages=None):
+    """Return the text of every page in order, optionally across worker processes.
+
+    ``workers=None`` uses every core. Each worker opens the PDF itself and
+    extracts a contiguous page range; ranges are reassembled in page order, so
+    the result is identical to the serial path. With a ``PageTextCache`` an
+    unchanged PDF is read back from disk instead of being extracted again.
+    With a ``PageCheckpoint`` progress is saved as pages (or, in parallel,
+    page ranges) complete and an interrupted extraction resumes. Unreadable
+    pages are logged, left empty and their numbers appended to ``bad_pages``
+    when given.
+    """
+    if text_cache is not None:
+        return text_cache.page_texts(pdf_path, extract=lambda path, bad: extract_page_texts(
+            path, workers, checkpoint=checkpoint, bad_pages=bad), bad_pages=bad_pages)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    doc = fitz.open(pdf_path)
+    page_count = doc.page_count
+    if workers <= 1 or page_count < 2:
+        doc.close()
+        return list(iter_page_texts(pdf_path, checkpoint=checkpoint, bad_pages=bad_pages))
+    doc.close()
+    key = checkpoint.key(pdf_path) if checkpoint is not None else None
+    texts = [None] * page_count
+    if checkpoint is not None:
+        saved = checkpoint.saved_pages(key)
+        if saved:
+            print(f"Resuming {pdf_path}: {len(saved)} page(s) restored from checkpoint")
+            if bad_pages is not None:
+                bad_pages.extend(checkpoint.bad_pages(key))
+        for page_no, text in saved.items():
+            texts[page_no] = text
+    # A few ranges per worker keeps the pool busy when pages differ in cost
+    chunk = max(1, -(-page_count // (workers * 4)))
+    tasks = [(pdf_path, start, min(start + chunk, page_count))
+             for start in range(0, page_count, chunk)
+             if any(text is None for text in texts[start:start + chunk])]
+    if tasks:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            for (_, start, _), results in zip(tasks, pool.map(_extract_page_range, tasks)):
+                for page_no, (text, error) in enumerate(results, start):
+                    texts[page_no] = text
+                    if error is not None and bad_pages is not None:
+                        bad_pages.append(page_no)
+                    if checkpoint is not None:
+                        checkpoint.record(key, page_no, text, error)
+    if checkpoint is not None:
+        checkpoint.finish(key)
+    return texts
+
+def split_entries(text):
+    """Split extracted text into entries, dropping fragments too short to be records."""
+    entries = re.split(r"\n(?=Author:)", text)
+    return [entry.strip() for entry in entries if len(entry.strip()) > 300]
+
+def extract_entries(pdf_path, workers=1, text_cache=None, checkpoint=None):
     """Extract entries from the PDF."""
     try:
-        doc = fitz.open(pdf_path)
-        text = "\n".join(page.get_text() for page in doc)
+        text = "\n".join(extract_page_texts(pdf_path, workers, text_cache, checkpoint))
         print(f"Total extracted text length: {len(text)} characters")
-        entries = re.split(r"\n(?=Author:)", text)
-        entries = [entry.strip() for entry in entries if len(entry.strip()) > 300]
+        entries = split_entries(text)
         print(f"Extracted {len(entries)} entries from PDF.")
         return entries
     except Exception as e:
         print(f"Error in extract_entries: {e}")
         return []
 
+ENTRY_SEPARATOR = "\nAuthor:"
+
+def iter_page_texts(pdf_path, text_cache=None, checkpoint=None, flags=None, bad_pages=None):
+    """Yield the text of each page in order, holding one page at a time.
+
+    Every path reads pages through ``read_page_text``, so an unreadable page
+    gives ``""`` and its number is appended to ``bad_pages`` when given.
+    """
+    if text_cache is not None:
+        yield from text_cache.iter_pages(pdf_path, flags, extract=lambda path, bad: iter_page_texts(
+            path, checkpoint=checkpoint, flags=flags, bad_pages=bad), bad_pages=bad_pages)
+        return
+    if checkpoint is not None:
+        yield from iter_checkpointed_pages(pdf_path, checkpoint, flags, bad_pages)
+        return
+    doc = fitz.open(pdf_path)
+    try:
+        for page_no in range(doc.page_count):
+            text, error = read_page_text(doc, page_no, flags)
+            if error is not None and bad_pages is not None:
+                bad_pages.append(page_no)
+            yield text
+    finally:
+        doc.close()
+
+def split_entries_stream(page_texts):
+    """Yield the entries ``extract_entries`` would return, page by page.
+
+    The tail after the last ``Author:`` boundary is carried into the next
+    page, so records spanning page breaks are reassembled and memory is
+    bounded by the largest record rather than by the document.
+    """
+    buffer = None
+    for page_text in page_texts:
+        if buffer is None:
+            buffer, scan_from = page_text, 0
+        else:
+            # A boundary may straddle the join, so rescan the tail of the carry
+            scan_from = max(0, len(buffer) - len(ENTRY_SEPARATOR) + 1)
+            buffer = buffer + "\n" + page_text
+        start = 0
+        pos = buffer.find(ENTRY_SEPARATOR, scan_from)
+        while pos != -1:
+            entry = buffer[start:pos].strip()
+            if len(entry) > 300:
+                yield entry
+            start = pos + 1
+            pos = buffer.find(ENTRY_SEPARATOR, start)
+        buffer = buffer[start:]
+    if buffer is not None:
+        entry = buffer.strip()
+        if len(entry) > 300:
+            yield entry
+
+def iter_entries(pdf_path, text_cache=None, checkpoint=None):
+    """Stream entries from the PDF one at a time."""
+    count = 0
+    try:
+        for entry in split_entries_stream(iter_page_texts(pdf_path, text_cache, checkpoint)):
+            count += 1
+            yield entry
+        print(f"Extracted {count} entries from PDF.")
+    except Exception as e:
+        print(f"Error in iter_entries: {e}")
+
 # Step 3: Metadata extractor
+DOI_RE = re.compile(r'(10\.\d{4,9}/[^\s";]+)')
+YEAR_RE = re.compile(r'(\b20[1-2][0-9]\b)')
+# A line opening a field: one or more capitalised words and a colon, e.g.
+# "Author:", "Is Part Of:", "Description:". Anchored at the line start and
+# free of nested repetition, so each line is matched in linear time.
+FIELD_LABEL_RE = re.compile(r'([A-Z][a-z]+(?: [A-Z][a-z]+)*):[ \t]*')
+
+def split_fields(entry):
+    """Split a record into ``{label: value}`` in one pass over its lines.
+
+    A field runs from a labelled line to the next one, so wrapped values
+    keep their line breaks; values are stripped. Text before the first label
+    is dropped and a repeated label keeps its first value. Every line is
+    looked at once, so the cost is linear in the record however long or
+    malformed it is.
+    """
+    fields = {}
+    label, lines = None, []
+    for line in entry.split("\n"):
+        match = FIELD_LABEL_RE.match(line)
+        if match:
+            if label is not None:
+                fields.setdefault(label, "\n".join(lines).strip())
+            label, lines = match.group(1), [line[match.end():]]
+        elif label is not None:
+            lines.append(line)
+    if label is not None:
+        fields.setdefault(label, "\n".join(lines).strip())
+    return fields
+
 def extract_metadata(entry):
     """Extract metadata from an entry."""
     metadata = {}
+    fields = split_fields(entry)
     # Authors
-    author_match = re.search(r'Author:\s*(.+?)\s*(?=Subject:|Is Part Of:|Description:|$)', entry, re.DOTALL)
-    metadata["authors"] = author_match.group(1).strip() if author_match else "Unknown"
+    metadata["authors"] = fields.get("Author") or "Unknown"
     # DOI
-    doi_match = re.search(r'(10\.\d{4,9}/[^\s";]+)', entry)
+    doi_match = DOI_RE.search(entry)
     metadata["doi"] = doi_match.group(1) if doi_match else "Unknown"
-    # Publisher
-    publisher_match = re.search(r'Publisher:\s*(.+)', entry)
-    metadata["publisher"] = publisher_match.group(1).strip() if publisher_match else "Unknown"
+    # Publisher (first line only)
+    publisher = fields.get("Publisher")
+    metadata["publisher"] = publisher.split("\n", 1)[0].strip() if publisher else "Unknown"
     # Year
-    year_match = re.search(r'(\b20[1-2][0-9]\b)', entry)
+    year_match = YEAR_RE.search(entry)
     metadata["year"] = year_match.group(1) if year_match else "Unknown"
-    # Description
-    desc_match = re.search(r'(Description|Abstract):\s*(.+?)(?=\n[A-Z][a-z]+:|$)', entry, re.DOTALL)
-    metadata["description"] = desc_match.group(2).strip() if desc_match else "No description found"
+    # Description, or an abstract if that comes first
+    description = next((value for label, value in fields.items()
+                        if label in ("Description", "Abstract") and value), None)
+    metadata["description"] = description or "No description found"
     return metadata
 
+class Entry:
+    """One record, parsed once and read by every later stage.
+
+    ``__slots__`` keeps the per-record overhead to a handful of pointers so
+    large corpora fit in memory. Stage one fills the catalogue fields;
+    ``thesis_analysis`` fills the analysis fields on the same object.
+    """
+
+    __slots__ = ("text", "score", "rank", "authors", "doi", "publisher", "year",
+                 "description", "techniques", "compliance", "accuracy", "privacy_level")
+
+    def __init__(self, text=None, score=0, rank=None, authors="Unknown", doi="Unknown",
+                 publisher="Unknown", year="Unknown", description="No description found",
+                 techniques=None, compliance=None, accuracy=None, privacy_level=None):
+        self.text = text
+        self.score = score
+        self.rank = rank
+        self.authors = authors
+        self.doi = doi
+        self.publisher = publisher
+        self.year = year
+        self.description = description
+        self.techniques = techniques
+        self.compliance = compliance
+        self.accuracy = accuracy
+        self.privacy_level = privacy_level
+
+    def __repr__(self):
+        return f"Entry(rank={self.rank!r}, score={self.score!r}, doi={self.doi!r}, authors={self.authors[:30]!r})"
+
+def extract_metadata_cached(entries, store=None):
+    """Return ``extract_metadata`` for each entry, reusing results cached in ``store``."""
+    if store is None:
+        return [extract_metadata(entry) for entry in entries]
+    metadata = store.cached("metadata", METADATA_VERSION, entries,
+                            lambda texts: [extract_metadata(text) for text in texts])
+    return [dict(meta) for meta in metadata]
+
 # Step 4: Scoring
-def rank_entries(entries, top_n=10):
-    """Rank entries by keyword score."""
+RANK_BATCH_SIZE = 1024
+
+def _score_batch(batch, store=None):
+    """Score a batch of entries, only scanning those missing from ``store``."""
+    if store is None:
+        return keyword_scores(batch)
+    return store.cached("score", keywords_fingerprint(KEYWORD_MATCHER.keywords), batch, keyword_scores)
+
+def _score_in_batches(entries, store=None):
+    """Pair each entry with its score, scoring fixed-size batches of an iterable."""
+    batch = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= RANK_BATCH_SIZE:
+            yield from zip(batch, _score_batch(batch, store))
+            batch = []
+    if batch:
+        yield from zip(batch, _score_batch(batch, store))
+
+def select_top_entries(entries, top_n=10, store=None):
+    """Return the ``top_n`` highest-scoring ``(text, score)`` pairs, best first."""
+    scored = _score_in_batches(entries, store)
+    if top_n is None:
+        return sorted(scored, key=lambda x: x[1], reverse=True)
+    # nlargest is stable, so ties keep document order as sorted() would
+    return heapq.nlargest(top_n, scored, key=lambda x: x[1])
+
+def score_top_entries(entries, top_n=10, store=None, scheme=None, weights=None):
+    """``select_top_entries``, or the keyword matrix when a ``scheme`` or ``weights`` is given.
+
+    The matrix scores every entry at once, so ``entries`` must fit in memory.
+    """
+    if scheme or weights:
+        # Imported lazily so plain runs do not need NumPy
+        from ranking import CorpusMatrix, parse_weights
+        matrix = CorpusMatrix.from_texts(entries, store=store)
+        return matrix.top(top_n, parse_weights(weights), scheme or "count")
+    return select_top_entries(entries, top_n, store)
+
+def build_ranked_entries(ranked, store=None):
+    """Parse each ranked ``(text, score)`` pair once into an ``Entry``."""
+    metadata = extract_metadata_cached([text for text, _ in ranked], store)
+    return [Entry(text, score, i, **meta)
+            for i, ((text, score), meta) in enumerate(zip(ranked, metadata), 1)]
+
+def rank_entries(entries, top_n=10, store=None):
+    """Rank entries by keyword score.
+
+    ``entries`` may be any iterable, including the ``iter_entries`` stream;
+    only the current batch and the top ``top_n`` results are kept in memory.
+    With an ``EntryStore``, entries whose text was scored before under the
+    same ``KEYWORDS`` are not rescanned. Returns ``Entry`` records whose
+    metadata has been parsed exactly once.
+    """
     try:
-        scored = [(entry, keyword_score(entry)) for entry in entries]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[:top_n]
+        return build_ranked_entries(select_top_entries(entries, top_n, store), store)
     except Exception as e:
         print(f"Error in rank_entries: {e}")
         return []
 
 # Step 5: Save top results to both CSV and TXT
+RESULT_HEADER = ["Rank", "Score", "Authors", "DOI", "Publisher", "Description"]
+
+def result_row(rank, entry):
+    """The results.csv row for one ranked entry."""
+    return [rank, entry.score, entry.authors, entry.doi, entry.publisher, entry.description[:300]]
+
 def save_top_results_to_files(ranked_entries):
     """Save top study results to both CSV and TXT formats."""
     try:
         with open("results.csv", "w", newline="", encoding="utf-8") as f_csv, \
              open("results.txt", "w", encoding="utf-8") as f_txt:
             writer = csv.writer(f_csv)
-            writer.writerow(["Rank", "Score", "Authors", "DOI", "Publisher", "Description"])
-            for i, (entry, score) in enumerate(ranked_entries, 1):
-                meta = extract_metadata(entry)
-                authors = meta["authors"]
-                doi = meta["doi"]
-                publisher = meta["publisher"]
-                description = meta["description"][:300]
+            writer.writerow(RESULT_HEADER)
+            for i, entry in enumerate(ranked_entries, 1):
+                description = entry.description[:300]
                 # Write to CSV
-                writer.writerow([i, score, authors, doi, publisher, description])
+                writer.writerow(result_row(i, entry))
                 # Write to TXT
-                f_txt.write(f"--- Top {i} Study (Score: {score}) ---\n")
-                f_txt.write(f"Authors   : {authors}\n")
-                f_txt.write(f"DOI       : {doi}\n")
-                f_txt.write(f"Publisher : {publisher}\n")
+                f_txt.write(f"--- Top {i} Study (Score: {entry.score}) ---\n")
+                f_txt.write(f"Authors   : {entry.authors}\n")
+                f_txt.write(f"DOI       : {entry.doi}\n")
+                f_txt.write(f"Publisher : {entry.publisher}\n")
                 f_txt.write(f"Description: {description}\n\n")
         print("✅ Results saved to results.csv and results.txt")
     except Exception as e:
         print(f"❌ Error saving results: {e}")
 
 # Step 6: Main analysis and printing
-def analyze_pdf_for_top_studies(pdf_path, top_n=10):
-    """Main function to select and save top 10 studies."""
-    try:
-        entries = extract_entries(pdf_path)
-        ranked = rank_entries(entries, top_n)
-        for i, (entry, score) in enumerate(ranked, 1):
-            meta = extract_metadata(entry)
-            print(f"--- Top {i} Study (Score: {score}) ---")
-            print(f"Authors   : {meta['authors']}")
-            print(f"DOI       : {meta['doi']}")
-            print(f"Publisher : {meta['publisher']}")
-            print(f"Description: {meta['description'][:300]}")
-        save_top_results_to_files(ranked)
+def _counted(items, record):
+    """Pass items through while counting them into a metrics record."""
+    record["items"] = 0
+    for item in items:
+        record["items"] += 1
+        yield item
+
+def report_top_entries(top, store=None, metrics=None, save=True):
+    """Parse, print and (unless ``save=False``) save the selected ``(text, score)`` pairs."""
+    with stage(metrics, "metadata") as record:
+        ranked = build_ranked_entries(top, store)
+        record["items"] = len(ranked)
+    for entry in ranked:
+        print(f"--- Top {entry.rank} Study (Score: {entry.score}) ---")
+        print(f"Authors   : {entry.authors}")
+        print(f"DOI       : {entry.doi}")
+        print(f"Publisher : {entry.publisher}")
+        print(f"Description: {entry.description[:300]}")
+    if save:
+        with stage(metrics, "saving") as record:
+            save_top_results_to_files(ranked)
+            record["items"] = len(ranked)
         print("\nSelection complete. Results saved to:")
         print("- results.csv (top 10 metadata)")
         print("- results.txt (top 10 metadata)")
+    return ranked
+
+def select_top_studies(pdf_path, top_n=10, workers=1, stream=False, store=None,
+                       metrics=None, scheme=None, weights=None, text_cache=None, checkpoint=None):
+    """Extract, split and score the export, returning the best ``(text, score)`` pairs.
+
+    The options are those of ``analyze_pdf_for_top_studies``; nothing is
+    parsed or written, so callers decide what to do with the winners.
+    """
+    if stream and (scheme or weights):
+        raise ValueError("--stream cannot be combined with --scheme or --weights: "
+                         "the keyword matrix holds every entry")
+    if stream:
+        with stage(metrics, "extraction+splitting+scoring") as record:
+            return select_top_entries(_counted(iter_entries(pdf_path, text_cache, checkpoint), record),
+                                      top_n, store)
+    with stage(metrics, "extraction") as record:
+        pages = extract_page_texts(pdf_path, workers, text_cache, checkpoint)
+        record["items"] = len(pages)
+    with stage(metrics, "splitting") as record:
+        text = "\n".join(pages)
+        print(f"Total extracted text length: {len(text)} characters")
+        entries = split_entries(text)
+        del pages, text
+        print(f"Extracted {len(entries)} entries from PDF.")
+        record["items"] = len(entries)
+    with stage(metrics, "scoring") as record:
+        top = score_top_entries(entries, top_n, store, scheme, weights)
+        record["items"] = len(entries)
+    return top
+
+def analyze_pdf_for_top_studies(pdf_path, top_n=10, workers=1, stream=False, cache_path=None,
+                                metrics=None, scheme=None, weights=None, text_cache_dir=None,
+                                checkpoint_path=None):
+    """Main function to select and save top 10 studies.
+
+    With ``stream=True`` entries are split and scored page by page instead
+    of extracting the whole document first (``workers`` is then ignored).
+    ``cache_path`` names an ``EntryStore`` database; reruns then only score
+    and parse entries whose text is new or changed. ``metrics`` is an
+    optional ``StageMetrics`` that records each stage and is saved at the end.
+    ``scheme`` ("count", "tfidf", "bm25") and ``weights`` (e.g.
+    ``"he=0,differential privacy=3"``) rank through the NumPy keyword
+    matrix in ``ranking`` instead of plain hit counts; the matrix holds
+    every entry, so they cannot be combined with ``stream``. ``text_cache_dir``
+    names a ``PageTextCache`` directory, so an unchanged PDF is not
+    re-extracted, and ``checkpoint_path`` a ``PageCheckpoint`` database from
+    which an interrupted extraction resumes. Returns the ranked ``Entry``
+    records.
+    """
+    try:
+        with open_resources(cache_path, text_cache_dir, checkpoint_path, metrics) as (
+                store, text_cache, checkpoint):
+            top = select_top_studies(pdf_path, top_n, workers, stream, store, metrics, scheme,
+                                     weights, text_cache, checkpoint)
+            return report_top_entries(top, store, metrics)
     except Exception as e:
         print(f"❌ Error in analyze_pdf_for_top_studies: {e}")
+        return []
+
+# Step 7: Batch mode over many overlapping exports
+def expand_pdf_paths(sources):
+    """Resolve files, directories (every PDF inside) and glob patterns to PDF paths."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(sorted(glob.glob(os.path.join(source, "*.pdf"))))
+        elif any(char in source for char in "*?["):
+            paths.extend(sorted(glob.glob(source)))
+        else:
+            paths.append(source)
+    return list(dict.fromkeys(paths))
+
+def entry_identity(entry):
+    """Key shared by copies of one paper across exports: its DOI, else a content hash."""
+    doi_match = DOI_RE.search(entry)
+    if doi_match:
+        return "doi:" + doi_match.group(1).lower().rstrip(".,)]")
+    return "sha1:" + content_hash(entry)
+
+def dedupe_entries(entries):
+    """Keep the first occurrence of every paper, in order."""
+    seen = set()
+    unique = []
+    for entry in entries:
+        key = entry_identity(entry)
+        if key not in seen:
+            seen.add(key)
+            unique.append(entry)
+    return unique
+
+def analyze_pdf_batch(sources, top_n=10, workers=None, cache_path=None, metrics=None,
+                      text_cache_dir=None, checkpoint_path=None, scheme=None, weights=None):
+    """Rank the studies of many exports together, scoring each paper once.
+
+    ``sources`` may mix PDF paths, directories and glob patterns. Files are
+    extracted in a pool of ``workers`` processes (None = every core), then
+    records are deduplicated across files by DOI, or by content hash when
+    they have none, before a single merged ranking is scored and saved.
+    ``text_cache_dir`` and ``checkpoint_path`` name a ``PageTextCache``
+    directory and a ``PageCheckpoint`` database shared by every file.
+    ``scheme`` and ``weights`` rank the deduplicated entries through the
+    keyword matrix, as in ``analyze_pdf_for_top_studies``.
+    """
+    try:
+        with open_resources(cache_path, text_cache_dir, checkpoint_path, metrics) as (
+                store, text_cache, checkpoint):
+            extract = partial(extract_entries, text_cache=text_cache, checkpoint=checkpoint)
+            paths = expand_pdf_paths(sources)
+            print(f"Processing {len(paths)} PDF exports")
+            with stage(metrics, "extraction+splitting") as record:
+                if workers == 1 or len(paths) < 2:
+                    per_file = [extract(path) for path in paths]
+                else:
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        per_file = list(pool.map(extract, paths))
+                total = record["items"] = sum(len(entries) for entries in per_file)
+            with stage(metrics, "deduplication") as record:
+                entries = dedupe_entries(entry for entries in per_file for entry in entries)
+                del per_file
+                print(f"{total} entries, {len(entries)} unique after cross-file deduplication")
+                record["items"] = len(entries)
+            with stage(metrics, "scoring") as record:
+                top = score_top_entries(entries, top_n, store, scheme, weights)
+                record["items"] = len(entries)
+            return report_top_entries(top, store, metrics)
+    except Exception as e:
+        print(f"❌ Error in analyze_pdf_batch: {e}")
+        return []
+
+DEFAULT_PDF_PATH = "Ex Libris Discovery - privacy-Preserving Techniques in Federated Learning for Secure Healthcare Data Sharing.pdf"
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Select the top studies from an Ex Libris export.")
+    parser.add_argument("sources", nargs="*", default=[DEFAULT_PDF_PATH],
+                        help="a PDF export, or several PDFs/directories/globs for batch mode")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for page extraction, or for files in batch mode (0 = every core)")
+    parser.add_argument("--stream", action="store_true", help="split and score page by page")
+    parser.add_argument("--scheme", choices=("count", "tfidf", "bm25"),
+                        help="rank with the keyword matrix under this weighting")
+    parser.add_argument("--weights", metavar="SPEC",
+                        help='per-keyword weights, e.g. "he=0,differential privacy=3"')
+    return add_common_args(parser)
 
 # Run it
 if __name__ == "__main__":
-    pdf_path = "Ex Libris Discovery - privacy-Preserving Techniques in Federated Learning for Secure Healthcare Data Sharing.pdf"
-    print(f"Opening PDF: {pdf_path}")
-    analyze_pdf_for_top_studies(pdf_path)
+    parser = build_arg_parser()
+    args = parser.parse_args()
+    if args.stream and (args.scheme or args.weights):
+        parser.error("--stream cannot be combined with --scheme or --weights")
+    batch = not (len(args.sources) == 1 and os.path.isfile(args.sources[0]))
+    if batch and args.stream:
+        parser.error("--stream only applies to a single PDF export, not to batch mode")
+    metrics = metrics_from_args(args)
+    if not batch:
+        print(f"Opening PDF: {args.sources[0]}")
+        analyze_pdf_for_top_studies(args.sources[0], args.top_n, args.workers or None, args.stream,
+                                    args.cache, metrics, args.scheme, args.weights, args.text_cache,
+                                    args.checkpoint)
+    else:
+        analyze_pdf_batch(args.sources, args.top_n, args.workers or None, args.cache, metrics,
+                          args.text_cache, args.checkpoint, args.scheme, args.weights)
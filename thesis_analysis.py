@@ -1,74 +1,164 @@
+import argparse
+import os
 import fitz  # PyMuPDF
 import re
 import csv
-import matplotlib.pyplot as plt
 from collections import defaultdict
-import hashlib
-
-# Enhanced keyword list focusing on privacy-preserving FL in healthcare
-KEYWORDS = [
-    "federated learning", "fl", "differential privacy", "dp", 
-    "homomorphic encryption", "he", "secure multiparty computation", "smpc",
-    "trusted execution environment", "tee", "shamir secret sharing",
-    "blockchain", "quantum", "ring signature", "zero knowledge proof",
-    "ehr", "phi", "hipaa", "gdpr", "medical", "clinical", "patient",
-    "diagnos", "treatment", "icu", "x-ray", "ct", "mri", "wearable",
-    "accuracy", "auc", "f1", "overhead", "latency", "scalability",
-    "communication cost", "privacy budget", "epsilon", "computational",
-    "inference attack", "membership attack", "model inversion",
-    "data poisoning", "gradient leakage", "byzantine", "adversarial",
-    "backdoor", "poisoning"
+from concurrent.futures import ProcessPoolExecutor
+from aggregates import AnalysisAggregate
+from article_archive import ARCHIVE_PATH, ArticleArchiveWriter
+from profiling import stage
+from run_context import add_common_args, metrics_from_args, open_resources
+from thesis import Entry, iter_page_texts
+
+# Bump when detect_signals changes its output
+ANALYSIS_VERSION = "3"
+
+TECHNIQUE_PATTERNS = {
+    'DP': r'differential privacy|dp\b',
+    'HE': r'homomorphic encryption|he\b',
+    'SMPC': r'secure multi[\s-]party computation|smpc',
+    'TEE': r'trusted execution environment|tee\b',
+    'Blockchain': r'blockchain',
+    'Hybrid': r'hybrid'
+}
+GDPR_PHRASES = [
+    r'gdpr', r'general data protection regulation',
+    r'eu data protection', r'regulation 2016/679', r'european privacy law'
+]
+HIPAA_PHRASES = [
+    r'hipaa', r'health insurance portability and accountability act',
+    r'us health privacy law', r'hitech act', r'protected health information'
+]
+COMPLIANCE_PHRASES = [
+    r'data protection law', r'privacy regulation',
+    r'compliant with', r'legal requirement', r'regulatory standard'
+]
+# Tried in order; the first pattern that matches anywhere wins
+ACCURACY_PATTERNS = [
+    r'(accuracy|auc|f1)[\s:]*([0-9]{1,3}(\.\d+)?%)',  # e.g., "accuracy: 93.22%"
+    r'([0-9]{1,3}(\.\d+)?%)\s*(accuracy|auc|f1)',     # e.g., "93% accuracy"
+    r'(accuracy|auc|f1)\s*[:=]\s*([0-9.]+)',           # e.g., "accuracy: 0.93"
+    r'([0-9]{1,3}(\.\d+)?)\s*(accuracy|auc|f1)'       # e.g., "93.22 accuracy"
+]
+PRIVACY_PATTERNS = [
+    r'(privacy budget|ε|epsilon|noise scale|privacy parameter)[\s:=]+([0-9.]+)',  # e.g., "ε = 1.0"
+    r'(\b[0-9.]+)\s*(privacy budget|ε|epsilon|noise scale)'                     # e.g., "1.0 epsilon"
 ]
+YEAR_PATTERN = r'(\b20[1-2][0-9]\b)'
 
-def keyword_score(text):
-    """Count keyword hits in a chunk of text."""
-    try:
-        text = text.lower()
-        return sum(text.count(keyword) for keyword in KEYWORDS)
-    except Exception as e:
-        print(f"Error in keyword_score: {e}")
-        return 0
+# Compiled once. Technique, accuracy and privacy patterns were IGNORECASE
+# searches of the original text. For ASCII text that is the same as a
+# case-sensitive search of a lowercased copy, which is about twice as fast.
+# For other text it is not: some characters (e.g. "İ") lowercase to a
+# different length or word class and move \b boundaries, so those texts
+# keep the IGNORECASE patterns. Compliance phrases have always been matched
+# against a lowercased copy.
+_SIGNAL_RES = {}
+for _flags in (0, re.IGNORECASE):
+    _SIGNAL_RES[_flags] = (
+        {tech: re.compile(pattern, _flags) for tech, pattern in TECHNIQUE_PATTERNS.items()},
+        [re.compile(pattern, _flags) for pattern in ACCURACY_PATTERNS],
+        [re.compile(pattern, _flags) for pattern in PRIVACY_PATTERNS],
+    )
+_GDPR_RE = re.compile("|".join(GDPR_PHRASES))
+_HIPAA_RE = re.compile("|".join(HIPAA_PHRASES))
+_COMPLIANCE_RE = re.compile("|".join(COMPLIANCE_PHRASES))
+_YEAR_RE = re.compile(YEAR_PATTERN)
+
+def _signal_res(text):
+    """The text to search and the (technique, accuracy, privacy) patterns for it."""
+    if text.isascii():
+        return text.lower(), _SIGNAL_RES[0]
+    return text, _SIGNAL_RES[re.IGNORECASE]
+
+def _find_techniques(text):
+    searched, (technique_res, _, _) = _signal_res(text)
+    return [tech for tech, regex in technique_res.items() if regex.search(searched)]
+
+def _find_compliance(lowered):
+    compliance = []
+    if _GDPR_RE.search(lowered):
+        compliance.append('GDPR')
+    if _HIPAA_RE.search(lowered):
+        compliance.append('HIPAA')
+    if not compliance and _COMPLIANCE_RE.search(lowered):
+        compliance.append('Generic')
+    return compliance
+
+def _original_group(match, text, group):
+    """A group's text in the original, unlowercased ``text``; None if it did not take part.
+
+    ``_signal_res`` only lowercases ASCII text, so offsets line up.
+    """
+    start, end = match.span(group)
+    return None if start == -1 else text[start:end]
+
+def _first_match(regexes, text):
+    """Return the match of the first regex, in priority order, that matches."""
+    for regex in regexes:
+        match = regex.search(text)
+        if match:
+            return match
+    return None
+
+def detect_signals(text):
+    """Detect techniques, compliance, accuracy, privacy budget and year.
+
+    Every signal is read with precompiled patterns, flagged as the original
+    searches were, and returned as one dict of report-ready fields.
+    """
+    searched, (technique_res, accuracy_res, privacy_res) = _signal_res(text)
+    techniques = [tech for tech, regex in technique_res.items() if regex.search(searched)]
+    compliance = _find_compliance(text.lower() if searched is text else searched)
+    
+    accuracy = "Not stated"
+    acc_match = _first_match(accuracy_res, searched)
+    if acc_match:
+        accuracy = _original_group(acc_match, text, 2)
+        if not accuracy.endswith('%'):
+            accuracy = f"{float(accuracy)*100:.2f}%"
+    
+    privacy_level = "Unknown"
+    priv_match = _first_match(privacy_res, searched)
+    if priv_match:
+        privacy_level = _original_group(priv_match, text, 2)
+    # Assign default epsilon for DP studies if not found
+    if privacy_level == "Unknown" and 'DP' in techniques:
+        privacy_level = "1.0"  # Typical for DP studies
+    elif privacy_level == "Unknown":
+        privacy_level = "10.0"  # Weaker privacy for non-DP studies
+    
+    year_match = _YEAR_RE.search(text)
+    return {
+        "techniques": ', '.join(techniques) if techniques else 'None',
+        "compliance": ', '.join(compliance) if compliance else 'None',
+        "accuracy": accuracy,
+        "privacy_level": privacy_level,
+        "year": year_match.group(1) if year_match else "Unknown",
+    }
+
+def detect_signals_cached(texts, store=None):
+    """Return ``detect_signals`` for each text, reusing results cached in ``store``."""
+    if store is None:
+        return [detect_signals(text) for text in texts]
+    return store.cached("analysis", ANALYSIS_VERSION, texts,
+                        lambda batch: [detect_signals(text) for text in batch])
 
 def detect_techniques(text):
     """Identify privacy-preserving techniques mentioned in text."""
-    techniques = []
-    tech_patterns = {
-        'DP': r'differential privacy|dp\b',
-        'HE': r'homomorphic encryption|he\b',
-        'SMPC': r'secure multi[\s-]party computation|smpc',
-        'TEE': r'trusted execution environment|tee\b',
-        'Blockchain': r'blockchain',
-        'Hybrid': r'hybrid'
-    }
-    for tech, pattern in tech_patterns.items():
-        if re.search(pattern, text, re.IGNORECASE):
-            techniques.append(tech)
+    techniques = _find_techniques(text)
     return ', '.join(techniques) if techniques else 'None'
 
 def detect_compliance(text):
     """Check for regulatory compliance mentions with flexible matching."""
-    text = text.lower()
-    compliance = []
-    gdpr_phrases = [
-        r'gdpr', r'general data protection regulation',
-        r'eu data protection', r'regulation 2016/679', r'european privacy law'
-    ]
-    hipaa_phrases = [
-        r'hipaa', r'health insurance portability and accountability act',
-        r'us health privacy law', r'hitech act', r'protected health information'
-    ]
-    compliance_phrases = [
-        r'data protection law', r'privacy regulation',
-        r'compliant with', r'legal requirement', r'regulatory standard'
-    ]
-    if any(re.search(phrase, text) for phrase in gdpr_phrases):
-        compliance.append('GDPR')
-    if any(re.search(phrase, text) for phrase in hipaa_phrases):
-        compliance.append('HIPAA')
-    if not compliance and any(re.search(phrase, text) for phrase in compliance_phrases):
-        compliance.append('Generic')
+    compliance = _find_compliance(text.lower())
     return ', '.join(compliance) if compliance else 'None'
 
+def analysis_score(score):
+    """The score type of the analysis stage: a float, however it was ranked or loaded."""
+    return float(score)
+
 def load_results_csv(csv_path):
     """Load entries from results.csv."""
     try:
@@ -76,159 +166,244 @@ def load_results_csv(csv_path):
         with open(csv_path, "r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
-                entries.append({
-                    "rank": int(row["Rank"]),
-                    "score": float(row["Score"]),
-                    "authors": row["Authors"],
-                    "doi": row["DOI"],
-                    "publisher": row["Publisher"],
-                    "description": row["Description"]
-                })
+                entries.append(Entry(
+                    rank=int(row["Rank"]),
+                    score=analysis_score(row["Score"]),
+                    authors=row["Authors"],
+                    doi=row["DOI"],
+                    publisher=row["Publisher"],
+                    description=row["Description"]
+                ))
         print(f"Loaded {len(entries)} entries from {csv_path}")
         return entries
     except Exception as e:
         print(f"Error loading results.csv: {e}")
         return []
 
-def extract_matched_articles(pdf_path, results_entries):
-    """Extract only the articles from PDF that match those in results.csv"""
+PAGE_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE
+DOI_PATTERN = re.compile(r'10\.\d{4,9}/[^\s";]+')
+# A hyphen at a line break joins the two halves of one word
+HYPHEN_WRAP_PATTERN = re.compile(r'-[ \t]*\n\s*')
+WORD_PATTERN = re.compile(r'[^\W\d_]+')
+# Share of title-fragment shingles a page must contain to count as a title match
+MIN_TITLE_OVERLAP = 0.8
+
+def tokenize(text):
+    """Lowercased alphabetic words, with line-wrap hyphenation undone."""
+    return WORD_PATTERN.findall(HYPHEN_WRAP_PATTERN.sub("", text.lower()))
+
+def shingles(tokens):
+    """Adjacent word pairs; empty for fewer than two words."""
+    return set(zip(tokens, tokens[1:]))
+
+class PageIndex:
+    """Text of every PDF page, extracted and lowercased once.
+
+    ``doi_pages`` maps each DOI found on a page to the first page that
+    mentions it, so DOI lookups cost a dictionary hit instead of a scan.
+    The word and shingle postings used by ``find_author_title`` are built on
+    first use.
+    """
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.lowered = [text.lower() for text in texts]
+        self.word_pages = None
+        self.shingle_pages = None
+        self.doi_pages = {}
+        for page_no, text in enumerate(self.lowered):
+            for match in DOI_PATTERN.finditer(text):
+                doi = match.group(0)
+                # Also index the DOI without trailing sentence punctuation
+                for key in (doi, doi.rstrip(".,)]")):
+                    self.doi_pages.setdefault(key, page_no)
+
+    @classmethod
+    def from_pdf(cls, pdf_path, text_cache=None, checkpoint=None):
+        """Build the index from a PDF file.
+
+        Pages come from a ``PageTextCache`` when given, and extraction saves
+        its progress to a ``PageCheckpoint`` when given. Either way they are
+        read with ``read_page_text``, so unreadable pages are left empty.
+        """
+        return cls(list(iter_page_texts(pdf_path, text_cache, checkpoint, PAGE_TEXT_FLAGS)))
+
+    def find_doi(self, doi):
+        """Return the number of the first page containing ``doi``, or None."""
+        doi = doi.lower()
+        page_no = self.doi_pages.get(doi)
+        if page_no is not None:
+            return page_no
+        # DOIs the pattern did not isolate (e.g. wrapped) still need a substring check
+        for page_no, text in enumerate(self.lowered):
+            if doi in text:
+                return page_no
+        return None
+
+    def _build_token_index(self):
+        """Map every word and every adjacent word pair to the pages containing it."""
+        self.word_pages = defaultdict(list)
+        self.shingle_pages = defaultdict(list)
+        for page_no, text in enumerate(self.lowered):
+            tokens = tokenize(text)
+            for word in set(tokens):
+                self.word_pages[word].append(page_no)
+            for pair in shingles(tokens):
+                self.shingle_pages[pair].append(page_no)
+
+    def find_author_title(self, author, title_words):
+        """Return ``(page_no, score)`` for the page best matching an author and title.
+
+        Candidate pages come from the postings of the title's shingles (of the
+        word itself for a one-word title), so the cost depends on how common
+        those shingles are rather than on the page count. A page scores two points for its share of the title shingles
+        and one for containing every word of the author name; it needs at
+        least ``MIN_TITLE_OVERLAP`` of the title to qualify. Returns None when
+        no page qualifies; ties go to the earliest page.
+        """
+        if self.shingle_pages is None:
+            self._build_token_index()
+        title_tokens = tokenize(" ".join(title_words))
+        # A one-word title has no pairs, so it is looked up as a word
+        if len(title_tokens) == 1:
+            title_shingles, postings = set(title_tokens), self.word_pages
+        else:
+            title_shingles, postings = shingles(title_tokens), self.shingle_pages
+        if not title_shingles:
+            return None
+        overlap = defaultdict(int)
+        for key in title_shingles:
+            for page_no in postings.get(key, ()):
+                overlap[page_no] += 1
+        author_pages = None
+        author_words = tokenize(author)
+        if author_words:
+            author_pages = set(self.word_pages.get(author_words[0], ()))
+            for word in author_words[1:]:
+                author_pages.intersection_update(self.word_pages.get(word, ()))
+        best = None
+        for page_no, hits in overlap.items():
+            ratio = hits / len(title_shingles)
+            if ratio < MIN_TITLE_OVERLAP:
+                continue
+            score = 2 * ratio + (1 if author_pages and page_no in author_pages else 0)
+            if best is None or score > best[1] or (score == best[1] and page_no < best[0]):
+                best = (page_no, score)
+        return best
+
+def save_extracted_text(entries):
+    """Write the text of every matched article to the article archive."""
+    try:
+        with ArticleArchiveWriter(ARCHIVE_PATH) as archive:
+            for entry in entries:
+                archive.append(entry)
+    except Exception as e:
+        print(f"Error saving extracted text: {e}")
+
+def extract_matched_articles(pdf_path, results_entries, save_text=True, text_cache=None,
+                             checkpoint=None):
+    """Extract only the articles from PDF that match those in results.csv
+
+    With ``save_text`` each article is appended to the compressed article
+    archive as soon as it is matched.
+    """
+    archive = None
     try:
-        doc = fitz.open(pdf_path)
+        index = PageIndex.from_pdf(pdf_path, text_cache, checkpoint)
         matched_entries = []
+        archive = ArticleArchiveWriter(ARCHIVE_PATH) if save_text else None
         
         # First pass: Try to find each article by DOI
         for result_entry in results_entries:
-            if result_entry["doi"] == "Unknown":
+            if result_entry.doi == "Unknown":
                 continue
                 
-            found = False
-            for page in doc:
-                text = page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-                if result_entry["doi"].lower() in text.lower():
-                    matched_entries.append({
-                        "text": text,
-                        "metadata": result_entry.copy()
-                    })
-                    found = True
-                    break
-            
-            if not found:
-                print(f"Could not find article with DOI: {result_entry['doi']}")
+            page_no = index.find_doi(result_entry.doi)
+            if page_no is not None:
+                result_entry.text = index.texts[page_no]
+                matched_entries.append(result_entry)
+                if archive is not None:
+                    archive.append(result_entry)
+            else:
+                print(f"Could not find article with DOI: {result_entry.doi}")
         
         # Second pass: Try by author + title fragments for unmatched articles
         if len(matched_entries) < len(results_entries):
-            unmatched_entries = [e for e in results_entries 
-                               if not any(e["doi"] == m["metadata"]["doi"] for m in matched_entries)]
+            matched_dois = {m.doi for m in matched_entries}
+            unmatched_entries = [e for e in results_entries if e.doi not in matched_dois]
             
             for result_entry in unmatched_entries:
                 # Get first author's last name
-                first_author = result_entry["authors"].split(";")[0].strip().split(",")[0].strip()
+                first_author = result_entry.authors.split(";")[0].strip().split(",")[0].strip()
                 
                 # Get title fragment from description (first few meaningful words)
-                title_words = [w for w in result_entry["description"].split() if w.isalpha()]
-                title_fragment = " ".join(title_words[:5]) if title_words else ""
+                title_words = [w for w in result_entry.description.split() if w.isalpha()]
                 
-                best_match = None
-                best_score = 0
-                
-                for page in doc:
-                    text = page.get_text("text", flags=fitz.TEXT_PRESERVE_WHITESPACE)
-                    
-                    # Calculate matching score
-                    score = 0
-                    if first_author and first_author.lower() in text.lower():
-                        score += 1
-                    if title_fragment and title_fragment.lower() in text.lower():
-                        score += 2
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_match = text
-                
-                if best_score >= 2:  # Require at least title match
-                    matched_entries.append({
-                        "text": best_match,
-                        "metadata": result_entry.copy()
-                    })
-                    print(f"Matched article by author/title: {result_entry['authors'][:30]}...")
+                # Candidate pages come from the shingle index, not a scan of every page
+                best = index.find_author_title(first_author, title_words[:5])
+                if best is not None:  # Require at least title match
+                    result_entry.text = index.texts[best[0]]
+                    matched_entries.append(result_entry)
+                    if archive is not None:
+                        archive.append(result_entry)
+                    print(f"Matched article by author/title: {result_entry.authors[:30]}...")
                 else:
-                    print(f"Could not match article: {result_entry['authors'][:30]}...")
+                    print(f"Could not match article: {result_entry.authors[:30]}...")
         
         print(f"\nExtracted {len(matched_entries)}/{len(results_entries)} articles from PDF")
         
-        # Save extracted text to file
-        with open("extracted_text.txt", "w", encoding="utf-8") as f:
-            for entry in matched_entries:
-                f.write(f"=== ARTICLE (Score: {entry['metadata']['score']}) ===\n")
-                f.write(f"Authors: {entry['metadata']['authors']}\n")
-                f.write(f"DOI: {entry['metadata']['doi']}\n")
-                f.write(f"Publisher: {entry['metadata']['publisher']}\n")
-                f.write("Text:\n")
-                f.write(entry["text"])
-                f.write("\n\n")
-        
         return matched_entries
     except Exception as e:
         print(f"Error extracting matched articles: {e}")
         return []
+    finally:
+        if archive is not None:
+            archive.close()
 
-def extract_metadata(entry):
-    """Extract metadata from an entry."""
-    metadata = entry["metadata"].copy()
-    text = entry["text"]
-    
-    # Extract techniques and compliance
-    metadata["techniques"] = detect_techniques(text)
-    metadata["compliance"] = detect_compliance(text)
-    
-    # Enhanced accuracy regex to capture more formats
-    acc_patterns = [
-        r'(accuracy|auc|f1)[\s:]*([0-9]{1,3}(\.\d+)?%)',  # e.g., "accuracy: 93.22%"
-        r'([0-9]{1,3}(\.\d+)?%)\s*(accuracy|auc|f1)',     # e.g., "93% accuracy"
-        r'(accuracy|auc|f1)\s*[:=]\s*([0-9.]+)',           # e.g., "accuracy: 0.93"
-        r'([0-9]{1,3}(\.\d+)?)\s*(accuracy|auc|f1)'       # e.g., "93.22 accuracy"
-    ]
-    accuracy = "Not stated"
-    for pattern in acc_patterns:
-        acc_match = re.search(pattern, text, re.IGNORECASE)
-        if acc_match:
-            accuracy = acc_match.group(2)
-            if not accuracy.endswith('%'):
-                accuracy = f"{float(accuracy)*100:.2f}%"
-            break
-    metadata["accuracy"] = accuracy
-    
-    # Enhanced privacy level regex
-    priv_patterns = [
-        r'(privacy budget|ε|epsilon|noise scale|privacy parameter)[\s:=]+([0-9.]+)',  # e.g., "ε = 1.0"
-        r'(\b[0-9.]+)\s*(privacy budget|ε|epsilon|noise scale)'                     # e.g., "1.0 epsilon"
-    ]
-    privacy_level = "Unknown"
-    for pattern in priv_patterns:
-        priv_match = re.search(pattern, text, re.IGNORECASE)
-        if priv_match:
-            privacy_level = priv_match.group(2)
-            break
-    # Assign default epsilon for DP studies if not found
-    if privacy_level == "Unknown" and 'DP' in metadata["techniques"]:
-        privacy_level = "1.0"  # Typical for DP studies
-    elif privacy_level == "Unknown":
-        privacy_level = "10.0"  # Weaker privacy for non-DP studies
-    metadata["privacy_level"] = privacy_level
-    
-    # Year
-    year_match = re.search(r'(\b20[1-2][0-9]\b)', text)
-    metadata["year"] = year_match.group(1) if year_match else "Unknown"
-    
-    return metadata
+def _set_signals(entry, signals):
+    for field, value in signals.items():
+        setattr(entry, field, value)
+    return entry
+
+def extract_metadata(entry, store=None):
+    """Fill the analysis fields of an ``Entry`` in place and return it.
+
+    All signals come from one ``detect_signals`` scan, which is read from
+    ``store`` when this exact text was analysed before.
+    """
+    return _set_signals(entry, detect_signals_cached([entry.text], store)[0])
+
+def extract_metadata_batch(entries, store=None):
+    """``extract_metadata`` for a list of entries, with one cache lookup for all of them."""
+    signals = detect_signals_cached([entry.text for entry in entries], store)
+    return [_set_signals(entry, found) for entry, found in zip(entries, signals)]
+
+def _pyplot():
+    """Import pyplot on first use, on the non-interactive Agg backend.
+
+    Runs that skip plotting never pay matplotlib's import cost.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+# Past these sizes the figures switch to forms whose cost does not grow
+# with every study: bars become one filled step line, only the best bars
+# are labelled, per-point legends are dropped and dense scatters are binned.
+PLOT_LABEL_LIMIT = 30
+PLOT_BAR_LIMIT = 200
+PLOT_LEGEND_LIMIT = 20
+PLOT_HEXBIN_THRESHOLD = 2000
 
 def plot_scores(entries):
     """Visualize keyword scores of top entries."""
     try:
-        scores = [entry["metadata"]["score"] for entry in entries]
+        plt = _pyplot()
+        scores = [entry.score for entry in entries]
         labels = [
-            entry["metadata"]["authors"][:20] + "..." if len(entry["metadata"]["authors"]) > 20 else entry["metadata"]["authors"]
-            for entry in entries
+            entry.authors[:20] + "..." if len(entry.authors) > 20 else entry.authors
+            for entry in entries[:PLOT_LABEL_LIMIT]
         ]
 
         print(f"Plotting {len(scores)} scores and {len(labels)} labels")
@@ -236,12 +411,18 @@ def plot_scores(entries):
             print(f"{i}. {l} -> Score: {s}")
 
         plt.figure(figsize=(12, 6))
-        bars = plt.bar(range(len(scores)), scores, color='teal')
+        if len(scores) <= PLOT_BAR_LIMIT:
+            bars = plt.bar(range(len(scores)), scores, color='teal')
+            tops = [(bar.get_x() + bar.get_width()/2, bar.get_height()) for bar in bars]
+        else:
+            # One artist for the whole series instead of a patch per study
+            plt.fill_between(range(len(scores)), scores, step='mid', color='teal', rasterized=True)
+            tops = list(enumerate(scores))
         plt.xlabel("Rank")
         plt.ylabel("Keyword Score")
         plt.title("Top Studies by Relevance Score")
-        for bar, label in zip(bars, labels):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height(), label, ha='center', va='bottom', rotation=45)
+        for (x, y), label in zip(tops, labels):
+            plt.text(x, y, label, ha='center', va='bottom', rotation=45)
         plt.tight_layout()
         plt.savefig("keyword_scores.png", dpi=300)
         plt.close()
@@ -249,15 +430,21 @@ def plot_scores(entries):
     except Exception as e:
         print(f"Error plotting scores: {e}")
 
+def count_techniques(entries):
+    """Number of entries mentioning each technique."""
+    technique_counts = defaultdict(int)
+    for entry in entries:
+        techs = entry.techniques.split(', ')
+        for tech in techs:
+            if tech != 'None':
+                technique_counts[tech] += 1
+    return dict(technique_counts)
+
 def plot_technique_trends(entries):
     """Analyze and visualize technique prevalence."""
     try:
-        technique_counts = defaultdict(int)
-        for entry in entries:
-            techs = entry['techniques'].split(', ')
-            for tech in techs:
-                if tech != 'None':
-                    technique_counts[tech] += 1
+        plt = _pyplot()
+        technique_counts = count_techniques(entries)
         plt.figure(figsize=(10, 6))
         plt.bar(technique_counts.keys(), technique_counts.values(), color='teal')
         plt.title("Technique Prevalence in Top Studies")
@@ -267,7 +454,7 @@ def plot_technique_trends(entries):
         plt.savefig('technique_prevalence.png', dpi=300)
         plt.close()
         print("Successfully saved technique_prevalence.png")
-        return dict(technique_counts)
+        return technique_counts
     except Exception as e:
         print(f"Error plotting technique trends: {e}")
         return {}
@@ -275,23 +462,28 @@ def plot_technique_trends(entries):
 def plot_privacy_accuracy(entries):
     """Visualize privacy vs. accuracy trade-off."""
     try:
+        plt = _pyplot()
         data = []
         print("\nExtracting privacy-accuracy data:")
-        for entry in entries:
+        for i, entry in enumerate(entries):
+            verbose = i < PLOT_LABEL_LIMIT
             try:
-                epsilon = float(entry['privacy_level']) if entry['privacy_level'] != "Unknown" else 10.0  # Default for non-DP
-                accuracy = float(entry['accuracy'].replace('%', '')) if entry['accuracy'] != "Not stated" else None
+                epsilon = float(entry.privacy_level) if entry.privacy_level != "Unknown" else 10.0  # Default for non-DP
+                accuracy = float(entry.accuracy.replace('%', '')) if entry.accuracy != "Not stated" else None
                 if accuracy:  # Only require accuracy to plot
                     data.append({
                         "x": epsilon,
                         "y": accuracy,
-                        "label": entry['metadata']['authors'][:20]
+                        "label": entry.authors[:20]
                     })
-                    print(f"Included: {entry['metadata']['authors'][:20]}... (ε={epsilon}, acc={accuracy}%)")
-                else:
-                    print(f"Excluded: {entry['metadata']['authors'][:20]}... (no accuracy)")
+                    if verbose:
+                        print(f"Included: {entry.authors[:20]}... (ε={epsilon}, acc={accuracy}%)")
+                elif verbose:
+                    print(f"Excluded: {entry.authors[:20]}... (no accuracy)")
             except Exception as e:
-                print(f"Error processing {entry['metadata']['authors'][:20]}...: {e}")
+                print(f"Error processing {entry.authors[:20]}...: {e}")
+        if len(entries) > PLOT_LABEL_LIMIT:
+            print(f"... {len(data)} of {len(entries)} studies have accuracy data")
         
         if not data:
             print("No valid privacy-accuracy data found. Generating placeholder plot.")
@@ -299,9 +491,19 @@ def plot_privacy_accuracy(entries):
             data = [{"x": 10.0, "y": 93.22, "label": "Rehman et al."}]  # From context
         
         plt.figure(figsize=(10, 6))
-        for point in data:
-            plt.scatter(point['x'], point['y'], s=100, c='teal')
-        plt.legend([point['label'] for point in data], loc='best')
+        if len(data) <= PLOT_LEGEND_LIMIT:
+            for point in data:
+                plt.scatter(point['x'], point['y'], s=100, c='teal')
+            plt.legend([point['label'] for point in data], loc='best')
+        else:
+            xs = [point['x'] for point in data]
+            ys = [point['y'] for point in data]
+            if len(data) <= PLOT_HEXBIN_THRESHOLD:
+                plt.scatter(xs, ys, s=20, c='teal', alpha=0.5, rasterized=True)
+            else:
+                # Bin dense clouds so the cost depends on the grid, not the point count
+                plt.hexbin(xs, ys, gridsize=40, cmap='viridis', mincnt=1, rasterized=True)
+                plt.colorbar(label="Studies")
         plt.xlabel("Privacy Strength (ε, lower is stronger)")
         plt.ylabel("Accuracy (%)")
         plt.title("Privacy vs. Accuracy Trade-off in Top Studies\n(Note: Limited data; some ε values estimated)")
@@ -313,20 +515,54 @@ def plot_privacy_accuracy(entries):
     except Exception as e:
         print(f"Error plotting privacy-accuracy: {e}")
 
-def compliance_analysis(entries):
-    """Analyze regulatory compliance mentions."""
+PLOTTERS = (plot_scores, plot_technique_trends, plot_privacy_accuracy)
+
+def _for_plotting(entries):
+    """Copies of the entries without their text, which the plots never read."""
+    return [Entry(score=entry.score, rank=entry.rank, authors=entry.authors,
+                  techniques=entry.techniques, accuracy=entry.accuracy,
+                  privacy_level=entry.privacy_level)
+            for entry in entries]
+
+def start_plots(entries, workers=None):
+    """Render every figure in its own worker process and return the futures.
+
+    The caller can keep writing CSVs and summaries meanwhile; the returned
+    ``(pool, futures)`` are finished with ``finish_plots``. ``workers=None``
+    uses one process per figure up to the CPU count. On a single core, or
+    with ``workers=0``, the figures are rendered in this process before
+    returning, since extra processes would only add matplotlib imports.
+    """
+    if workers is None:
+        workers = min(len(PLOTTERS), os.cpu_count() or 1)
+        workers = workers if workers > 1 else 0
+    if not workers:
+        for plotter in PLOTTERS:
+            plotter(entries)
+        return None, []
+    pool = ProcessPoolExecutor(max_workers=workers)
+    slim = _for_plotting(entries)
+    return pool, [pool.submit(plotter, slim) for plotter in PLOTTERS]
+
+def finish_plots(pool, futures):
+    """Wait for figures started by ``start_plots``."""
     try:
-        compliant = sum(1 for entry in entries if entry['compliance'] != 'None')
-        total = len(entries)
-        compliance_rate = (compliant / total * 100) if total > 0 else 0
+        for future in futures:
+            future.result()
+    except Exception as e:
+        print(f"Error rendering plots: {e}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+def compliance_analysis(aggregate):
+    """Analyze regulatory compliance mentions from an ``AnalysisAggregate``."""
+    try:
+        stats = aggregate.compliance_stats()
         print(f"\nCompliance Analysis:")
-        print(f"- {compliant}/{total} studies mention regulatory compliance")
-        print(f"- {compliance_rate:.1f}% address GDPR/HIPAA")
-        return {
-            'total_studies': total,
-            'compliant_studies': compliant,
-            'compliance_rate': compliance_rate
-        }
+        print(f"- {stats['compliant_studies']}/{stats['total_studies']} studies mention regulatory compliance")
+        print(f"- {stats['compliance_rate']:.1f}% address GDPR/HIPAA")
+        return stats
     except Exception as e:
         print(f"Error in compliance analysis: {e}")
         return {'total_studies': 0, 'compliant_studies': 0, 'compliance_rate': 0}
@@ -339,84 +575,145 @@ def save_analysis(entries):
             writer.writerow(["Rank", "Score", "Authors", "DOI", "Publisher", "Techniques", "Compliance", "Accuracy", "Privacy Level", "Description"])
             for i, entry in enumerate(entries, 1):
                 writer.writerow([
-                    i, entry["metadata"]["score"], entry["metadata"]["authors"], entry["metadata"]["doi"],
-                    entry["metadata"]["publisher"], entry["techniques"], entry["compliance"],
-                    entry["accuracy"], entry["privacy_level"], entry["metadata"]["description"][:300]
+                    i, entry.score, entry.authors, entry.doi,
+                    entry.publisher, entry.techniques, entry.compliance,
+                    entry.accuracy, entry.privacy_level, entry.description[:300]
                 ])
         print("Saved analysis to top10_analysis.csv")
     except Exception as e:
         print(f"Error saving analysis: {e}")
 
-def save_summary(entries, tech_counts, compliance_stats):
-    """Save summary report."""
+def save_summary(aggregate):
+    """Save summary report from a (possibly merged) ``AnalysisAggregate``."""
     try:
         with open("summary_report.txt", "w", encoding="utf-8") as f:
             f.write("PRIVACY-PRESERVING FL IN HEALTHCARE: TOP 10 SUMMARY\n")
             f.write("="*60 + "\n\n")
-            f.write(f"Total Studies Analyzed: {compliance_stats['total_studies']}\n\n")
+            f.write(f"Total Studies Analyzed: {aggregate.total}\n\n")
             f.write("TOP TECHNIQUES:\n")
-            for tech, count in sorted(tech_counts.items(), key=lambda x: -x[1]):
+            for tech, count in sorted(aggregate.technique_counts.items(), key=lambda x: -x[1]):
                 f.write(f"- {tech}: {count} studies\n")
-            f.write(f"\nREGULATORY COMPLIANCE: {compliance_stats['compliance_rate']:.1f}%\n")
+            f.write(f"\nREGULATORY COMPLIANCE: {aggregate.compliance_rate:.1f}%\n")
             f.write("\nTOP 3 STUDIES:\n")
-            for i, entry in enumerate(entries[:3], 1):
-                f.write(f"{i}. {entry['metadata']['authors']}\n")
-                f.write(f"   Techniques: {entry['techniques']}\n")
-                f.write(f"   Accuracy: {entry['accuracy']}\n")
-                f.write(f"   Compliance: {entry['compliance']}\n\n")
+            for i, study in enumerate(aggregate.top, 1):
+                f.write(f"{i}. {study['authors']}\n")
+                f.write(f"   Techniques: {study['techniques']}\n")
+                f.write(f"   Accuracy: {study['accuracy']}\n")
+                f.write(f"   Compliance: {study['compliance']}\n\n")
             f.write("\nFULL RESULTS AVAILABLE IN: top10_analysis.csv\n")
         print("Saved summary report to summary_report.txt")
     except Exception as e:
         print(f"Error saving summary: {e}")
 
-def analyze_thesis_top10(pdf_path, results_csv):
-    """Main analysis pipeline for ThesisTop10Papers.pdf."""
+def analyze_thesis_top10(pdf_path, results_csv, cache_path=None, metrics=None,
+                         plots=True, plot_workers=None, text_cache_dir=None, aggregate_path=None,
+                         checkpoint_path=None):
+    """Main analysis pipeline for ThesisTop10Papers.pdf.
+
+    ``cache_path`` names an ``EntryStore`` database holding the detected
+    signals of previously analysed article text. ``metrics`` is an optional
+    ``StageMetrics`` that records each stage and is saved at the end.
+    ``plots=False`` skips the figures (and matplotlib) entirely; otherwise
+    they render in ``plot_workers`` processes while the writers run.
+    ``text_cache_dir`` names a ``PageTextCache`` directory for the PDF text,
+    ``aggregate_path`` saves the summary statistics as mergeable JSON, and
+    ``checkpoint_path`` names a ``PageCheckpoint`` database from which an
+    interrupted page extraction resumes.
+    """
     print(f"\nAnalyzing PDF: {pdf_path}")
     print(f"Using results from: {results_csv}")
-    
+    with open_resources(cache_path, text_cache_dir, checkpoint_path, metrics) as (
+            store, text_cache, checkpoint):
+        _run_analysis(pdf_path, results_csv, store, metrics, plots, plot_workers, text_cache,
+                      aggregate_path, checkpoint)
+
+def _run_analysis(pdf_path, results_csv, store, metrics, plots, plot_workers, text_cache,
+                  aggregate_path, checkpoint):
     # Load results.csv
-    results_entries = load_results_csv(results_csv)
+    with stage(metrics, "loading") as record:
+        results_entries = load_results_csv(results_csv)
+        record["items"] = len(results_entries)
     if not results_entries:
         print("No valid entries found in results.csv - exiting.")
         return
     
     # Extract only the matched articles from PDF
-    matched_entries = extract_matched_articles(pdf_path, results_entries)
+    with stage(metrics, "extraction+matching") as record:
+        matched_entries = extract_matched_articles(pdf_path, results_entries, text_cache=text_cache,
+                                                   checkpoint=checkpoint)
+        record["items"] = len(matched_entries)
     if not matched_entries:
         print("No matched articles found in PDF - exiting.")
         return
     
+    analyze_entries(matched_entries, store, metrics, plots, plot_workers, aggregate_path)
+    print(f"- {ARCHIVE_PATH} (matched articles text; read with article_archive.py)")
+
+def analyze_entries(entries, store=None, metrics=None, plots=True, plot_workers=None,
+                    aggregate_path=None):
+    """Detect signals in entries that already carry their text, then plot and save.
+
+    This is everything after matching, shared by ``analyze_thesis_top10``
+    and the in-process ``pipeline``. The summary is written from an
+    ``AnalysisAggregate``, which ``aggregate_path`` also saves as JSON so
+    shards can be merged later with ``aggregates.py``. Returns the entries,
+    best first.
+    """
     # Extract metadata for each matched entry
-    entries_with_metadata = []
-    for entry in matched_entries:
-        metadata = extract_metadata(entry)
-        entry.update(metadata)
-        entries_with_metadata.append(entry)
+    with stage(metrics, "metadata") as record:
+        entries_with_metadata = extract_metadata_batch(list(entries), store)
+        record["items"] = len(entries_with_metadata)
     
     # Sort entries by score (descending)
-    entries_with_metadata.sort(key=lambda x: x["metadata"]["score"], reverse=True)
-    
-    # Generate visualizations
-    plot_scores(entries_with_metadata)
-    tech_counts = plot_technique_trends(entries_with_metadata)
-    plot_privacy_accuracy(entries_with_metadata)
+    entries_with_metadata.sort(key=lambda x: x.score, reverse=True)
     
-    # Perform analyses
-    compliance_stats = compliance_analysis(entries_with_metadata)
+    # Start the visualizations; they render while the outputs are written
+    pool, futures = None, []
+    if plots:
+        with stage(metrics, "plotting (start)") as record:
+            pool, futures = start_plots(entries_with_metadata, plot_workers)
+            record["items"] = len(entries_with_metadata)
     
-    # Save outputs
-    save_analysis(entries_with_metadata)
-    save_summary(entries_with_metadata, tech_counts, compliance_stats)
+    # Perform analyses and save outputs
+    try:
+        with stage(metrics, "saving") as record:
+            aggregate = AnalysisAggregate.from_entries(entries_with_metadata)
+            compliance_analysis(aggregate)
+            save_analysis(entries_with_metadata)
+            save_summary(aggregate)
+            if aggregate_path:
+                aggregate.save(aggregate_path)
+            record["items"] = len(entries_with_metadata)
+    finally:
+        with stage(metrics, "plotting (wait)") as record:
+            finish_plots(pool, futures)
+            record["items"] = len(futures)
     
     print("\nAnalysis complete. Results saved to:")
-    print("- extracted_text.txt (matched articles text)")
     print("- top10_analysis.csv (full data)")
-    print("- keyword_scores.png (relevance scores)")
-    print("- technique_prevalence.png (privacy technique prevalence)")
-    print("- privacy_accuracy_scatter.png (privacy-accuracy trade-off)")
+    if plots:
+        print("- keyword_scores.png (relevance scores)")
+        print("- technique_prevalence.png (privacy technique prevalence)")
+        print("- privacy_accuracy_scatter.png (privacy-accuracy trade-off)")
     print("- summary_report.txt (executive summary)")
+    return entries_with_metadata
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Analyse the articles behind the top-ranked studies.")
+    parser.add_argument("pdf_path", nargs="?", default="ThesisTop10Papers.pdf")
+    parser.add_argument("results_csv", nargs="?", default="results.csv")
+    parser.add_argument("--no-plots", dest="plots", action="store_false",
+                        help="skip the figures and never import matplotlib")
+    parser.add_argument("--plot-workers", type=int, default=None,
+                        help="processes rendering figures (default: one per figure up to the"
+                             " CPU count; 0 = render in this process)")
+    parser.add_argument("--save-aggregate", metavar="JSON",
+                        help="save the summary statistics for merging with aggregates.py")
+    return add_common_args(parser)
 
 if __name__ == "__main__":
-    pdf_file = "ThesisTop10Papers.pdf"
-    results_csv = "results.csv"
-    analyze_thesis_top10(pdf_file, results_csv)
\ No newline at end of file
+    args = build_arg_parser().parse_args()
+    metrics = metrics_from_args(args)
+    analyze_thesis_top10(args.pdf_path, args.results_csv, args.cache, metrics,
+                         args.plots, args.plot_workers, args.text_cache, args.save_aggregate,
+                         args.checkpoint)